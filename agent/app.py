@@ -7,11 +7,39 @@ import json
 import asyncio
 import aiohttp
 import time
-from livekit import agents
-from livekit.agents import Agent, AgentSession, JobContext, WorkerOptions
+import threading
+import traceback
+from livekit import agents, rtc
+from livekit.agents import (
+    Agent, AgentSession, JobContext, JobExecutorType, JobProcess, JobRequest, WorkerOptions,
+)
 from livekit.plugins import openai, silero, deepgram
 from dotenv import load_dotenv
+from scoring import LiveScorer
+from recorder import SessionRecorder, recording_path
+from metering import UsageMeter, record_session_usage, BUDGET_OK, BUDGET_TIGHT, BUDGET_EXHAUSTED
+from observability import (
+    METRICS, FIRST_AUDIO_BUCKETS, MAX_CONCURRENT_SESSIONS, admit_job, admitted_jobs, flush_job_metrics,
+    note_worker_alive, start_job_metrics, start_metrics_server,
+)
+from watchdog import get_watchdog, process_summary, OFFLOAD_AGENT_SETUP
+from content import get_content, refresh_content
+from speech_analytics import SpeechAnalytics, SPEECH_ANALYTICS_ENABLED, SAMPLE_RATE
+from results import (
+    UPLOAD_ATTEMPTS, UPLOAD_MAX_RETRY_AFTER, UPLOAD_TIMEOUT, SessionClock, build_envelope, encode_envelope, new_idempotency_key,
+)
 load_dotenv()
+
+# "process": one job process per interview (LiveKit default).
+# "multiplexed": LiveKit's thread executor. Each interview runs on its own
+# thread and event loop inside the main worker process, next to the LiveKit
+# worker connection and the metrics server, sharing the VAD model and question
+# index. This saves a process per interview, at a cost. job_memory_limit_mb is
+# not enforced. Failure isolation covers only Python exceptions: a native crash
+# in one interview (ONNX/VAD, audio codecs) takes down the whole worker and
+# every interview on it.
+AGENT_EXECUTION_MODE = os.environ.get("AGENT_EXECUTION_MODE", "process")
+
 def check_environment_vars():
     required_vars = [
         "LIVEKIT_URL",
@@ -28,526 +56,103 @@ def check_environment_vars():
         sys.exit(1)
     print("All required API keys loaded.", flush=True)
 
-# Question banks by interview type and difficulty
-QUESTION_BANKS = {
-    "frontend": {
-        "beginner": [
-            "Could you walk me through your process of building a responsive layout from scratch?",
-            "How do you usually decide between let, const, and var when writing JavaScript?",
-            "Can you explain how you handle basic state and props in a React application?",
-            "What's your approach to semantic HTML, and why do you think it matters?",
-            "How would you explain the CSS box model to a junior developer?",
-            "Tell me about how you handle forms and form validation on the frontend.",
-            "What's the difference between inline, block, and inline-block elements, and when do you use each?",
-            "How do you approach making a website accessible for screen readers?",
-            "Can you explain the difference between relative, absolute, and fixed positioning in CSS?",
-            "Walk me through how you would fetch data from an API and display it in a React component.",
-            "What tools do you use for debugging CSS layout issues?",
-            "How do you structure your component files and folders in a React project?",
-        ],
-        "intermediate": [
-            "If you noticed your React app was rendering slowly, what steps would you take to debug and fix it?",
-            "Can you walk me through a practical scenario where you used closures to solve a problem?",
-            "How do you usually handle complex state management? When would you reach for Redux or Context?",
-            "What's your strategy for writing clean, maintainable, and reusable CSS in a large project?",
-            "Tell me about a time you had to optimize the loading speed or Critical Rendering Path of a web page.",
-            "How do you implement code-splitting and lazy loading in a React application?",
-            "Can you explain how React's reconciliation algorithm works and how the virtual DOM helps performance?",
-            "Walk me through how you'd build a custom debounced search input from scratch.",
-            "How do you approach testing React components? What's your strategy for unit vs integration tests?",
-            "Tell me about your experience with TypeScript in frontend projects. What problems does it solve?",
-            "How do you handle authentication flows on the frontend, including token storage and refresh?",
-            "What's your approach to handling errors gracefully in a React application — both API errors and rendering errors?",
-        ],
-        "advanced": [
-            "Walk me through how you would design and implement a custom React hook for a complex data-fetching scenario.",
-            "How do you approach managing a large-scale frontend architecture? Have you ever dealt with micro-frontends?",
-            "Tell me about your strategy for optimizing the bundle size of a heavy, enterprise-level web app.",
-            "Can you explain the JavaScript event loop and how you handle complex asynchronous operations?",
-            "How do you ensure accessibility standards are met across a complex, dynamic web application?",
-            "Walk me through implementing a real-time collaborative editing feature, like Google Docs, on the frontend.",
-            "How would you architect a frontend application that needs to work offline and sync data when back online?",
-            "Tell me about your experience with web performance metrics — CLS, LCP, FID — and how you optimize for them.",
-            "How do you approach incremental migration of a legacy jQuery or Angular app to React without a full rewrite?",
-            "Can you explain how you'd implement a design system with component versioning across multiple teams?",
-            "Walk me through the security considerations when building a frontend that handles sensitive user data.",
-            "How do you handle internationalization and right-to-left language support in a complex SPA?",
-        ],
-    },
-    "backend": {
-        "beginner": [
-            "When starting a new project, how do you decide whether to use a SQL or NoSQL database?",
-            "Can you walk me through how you design RESTful API endpoints?",
-            "How do you use middleware in frameworks like Express.js? Can you give a practical example?",
-            "Explain how you handle user input validation and basic security in your routes.",
-            "What's your approach to managing environment variables and secrets in a project?",
-            "How do you structure your project folders for a backend application?",
-            "Can you explain what a JOIN is in SQL and when you'd use different types?",
-            "What's the purpose of status codes in HTTP, and which ones do you find yourself using most?",
-            "How do you handle file uploads in a backend API?",
-            "Tell me about how you approach logging and debugging in server-side applications.",
-            "What's the difference between synchronous and asynchronous code execution in Node.js?",
-            "How do you handle database connection errors or timeouts gracefully?",
-        ],
-        "intermediate": [
-            "Walk me through how you handle user authentication and authorization in your applications.",
-            "Tell me about a time a database query was bottlenecking your app. How did you optimize it?",
-            "How do you structure your error handling in a complex backend service?",
-            "Can you explain how you'd implement connection pooling and why it's necessary?",
-            "What's your approach to writing automated tests for your backend endpoints?",
-            "How do you design a database schema that balances normalization with query performance?",
-            "Walk me through implementing a caching layer — when do you use Redis vs in-memory caching?",
-            "How do you handle API versioning when you need to make breaking changes?",
-            "Tell me about your approach to implementing webhook systems that are reliable and idempotent.",
-            "How do you secure an API against common vulnerabilities like SQL injection, XSS, and CSRF?",
-            "Can you explain the trade-offs between horizontal and vertical scaling for a backend service?",
-            "How do you design background job processing for tasks like sending emails or generating reports?",
-        ],
-        "advanced": [
-            "If our user base suddenly spiked to a million concurrent users, how would you architect the backend to handle the load?",
-            "Tell me about your experience with implementing distributed transactions or event-driven architectures.",
-            "How do you implement robust rate limiting to protect your APIs from abuse?",
-            "Walk me through your strategies for database replication, sharding, and high availability.",
-            "How do you handle asynchronous background processing for heavy, time-consuming tasks?",
-            "Tell me about designing a multi-tenant SaaS backend — how do you isolate data and handle shared resources?",
-            "How would you implement a real-time event streaming system using something like Kafka or RabbitMQ?",
-            "Walk me through designing an API gateway that handles authentication, rate limiting, and request routing.",
-            "How do you approach database migrations in production without downtime?",
-            "Tell me about your strategy for implementing distributed caching with cache invalidation.",
-            "How do you design a backend system that provides strong consistency guarantees while remaining performant?",
-            "Walk me through implementing observability — structured logging, distributed tracing, and metrics collection.",
-        ],
-    },
-    "fullstack": {
-        "beginner": [
-            "How do you typically structure the communication between your frontend and backend?",
-            "Can you walk me through the complete lifecycle of a user logging into an app, from the button click to the database?",
-            "What's your approach to handling CORS issues when they pop up during development?",
-            "How do you ensure data stays synchronized between the client and the server?",
-            "What's your preferred workflow for debugging an issue that spans both the frontend and backend?",
-            "Tell me about how you set up a development environment for a full-stack project.",
-            "How do you handle image or file uploads from the frontend all the way to storage?",
-            "What's your approach to deploying a full-stack app for the first time?",
-            "How do you decide which logic should live on the frontend versus the backend?",
-            "Can you walk me through building a simple CRUD feature from database to UI?",
-            "What tools do you use for API testing during development?",
-            "How do you handle loading states and error states in the UI when making API calls?",
-        ],
-        "intermediate": [
-            "How do you approach securing sensitive data, like passwords and API keys, across the entire stack?",
-            "Can you explain your strategy for implementing JWT securely?",
-            "How would you design and implement a feature that requires real-time updates for the user, like a chat system?",
-            "When building a new app, how do you decide between Server-Side Rendering and Client-Side Rendering?",
-            "Walk me through how you handle caching at different layers to improve overall application performance.",
-            "How do you implement role-based access control that works consistently across frontend and backend?",
-            "Tell me about your approach to handling database transactions that involve multiple services.",
-            "How do you design a search feature with filtering, sorting, and pagination across the full stack?",
-            "Walk me through your strategy for handling file storage — when do you use local storage vs cloud services like S3?",
-            "How do you approach performance optimization when both the frontend and backend could be the bottleneck?",
-            "Tell me about implementing email notifications or in-app notifications across the full stack.",
-            "How do you manage shared validation logic between the frontend and backend?",
-        ],
-        "advanced": [
-            "If you had to migrate a legacy monolithic application to a microservices architecture, what would be your first few steps?",
-            "Design a real-time notification system architecture that needs to scale to millions of active users.",
-            "How would you implement end-to-end encryption in a full-stack messaging application?",
-            "Walk me through how you'd design a robust CI/CD pipeline for a complex full-stack application.",
-            "How do you maintain observability, logging, and tracing across multiple full-stack services in production?",
-            "Tell me about architecting a multi-region deployment for a full-stack app with data consistency requirements.",
-            "How would you design a feature flag system that controls rollout across both frontend and backend?",
-            "Walk me through building a payment processing system — handling Stripe or Razorpay webhooks, idempotency, and edge cases.",
-            "How do you approach building a white-label SaaS product where each tenant can customize their experience?",
-            "Tell me about implementing server-sent events or WebSockets at scale with proper error recovery.",
-            "How would you design a data export feature that handles millions of rows without blocking the server?",
-            "Walk me through your strategy for zero-downtime database schema migrations in a full-stack production app.",
-        ],
-    },
-    "devops": {
-        "beginner": [
-            "How do you use Docker in your daily development workflow? What benefits does it bring you?",
-            "Can you walk me through your ideal CI/CD pipeline setup for a standard web application?",
-            "How do you approach version control and branching strategies in a team environment?",
-            "Explain how you use reverse proxies like Nginx or HAProxy in your infrastructure.",
-            "What's your standard process for safely applying updates or patches to a server?",
-            "How do you monitor server health and resource usage in your current setup?",
-            "Tell me about your experience with Linux command-line tools for troubleshooting.",
-            "What's the difference between a container and a virtual machine, and when would you choose each?",
-            "How do you handle SSH key management and access control for servers?",
-            "Can you explain how DNS works and how you've configured it for projects?",
-            "How do you back up databases and application data?",
-            "What's your approach to documenting infrastructure and deployment procedures?",
-        ],
-        "intermediate": [
-            "Walk me through the steps you take when setting up a new Kubernetes cluster.",
-            "How do you implement Infrastructure as Code? What tools do you prefer and why?",
-            "Can you explain your strategy for executing zero-downtime deployments, like blue-green or canary?",
-            "How do you set up monitoring and alerting to catch infrastructure issues before users notice them?",
-            "What's your approach to managing and rotating secrets in a production environment?",
-            "Tell me about implementing auto-scaling policies — how do you decide scaling triggers and limits?",
-            "How do you handle log aggregation and centralized logging across multiple services?",
-            "Walk me through setting up a multi-stage Docker build for a production application.",
-            "How do you approach network security — firewalls, VPCs, and network policies in cloud environments?",
-            "Tell me about your experience with database DevOps — automated backups, point-in-time recovery, replication.",
-            "How do you manage configuration across different environments (dev, staging, production)?",
-            "What's your strategy for handling SSL/TLS certificate management and renewal?",
-        ],
-        "advanced": [
-            "Walk me through your approach to disaster recovery. What happens if an entire availability zone goes down?",
-            "How do you implement and enforce security policies across a large-scale Kubernetes cluster?",
-            "Explain your experience with service mesh architectures. When do you think they become necessary?",
-            "How do you optimize cloud infrastructure costs while maintaining high performance and availability?",
-            "Tell me about your experience with chaos engineering. How do you intentionally break systems to make them more resilient?",
-            "Walk me through designing a multi-cloud or hybrid-cloud strategy and the challenges involved.",
-            "How do you handle compliance requirements like SOC 2, HIPAA, or GDPR at the infrastructure level?",
-            "Tell me about implementing a GitOps workflow — how does it differ from traditional CI/CD?",
-            "How do you architect observability for a system with hundreds of microservices?",
-            "Walk me through your strategy for rolling back a failed deployment that has already affected live traffic.",
-            "How do you design infrastructure that can handle 10x traffic spikes during peak events?",
-            "Tell me about your approach to container security — image scanning, runtime protection, and policy enforcement.",
-        ],
-    },
-    "ai_ml_engineer": {
-        "beginner": [
-            "Can you walk me through the basic steps of preparing a raw dataset for a machine learning model?",
-            "How do you usually decide between using a classification algorithm versus a regression algorithm?",
-            "Tell me about your approach to splitting data into training, validation, and test sets.",
-            "How would you explain the concept of overfitting to someone who isn't technical?",
-            "What standard metrics do you look at to evaluate the performance of a basic model?",
-            "Can you explain the difference between supervised and unsupervised learning with examples?",
-            "How do you handle categorical features in your datasets?",
-            "Tell me about your experience with basic visualization tools for understanding data distributions.",
-            "What's your approach to dealing with missing values in a dataset?",
-            "How do you choose between different machine learning algorithms for a given problem?",
-            "Can you explain what cross-validation is and why it's important?",
-            "Tell me about a simple ML project you've completed from data collection to prediction.",
-        ],
-        "intermediate": [
-            "Walk me through a time you had to deal with a highly imbalanced dataset. What techniques did you use?",
-            "How do you approach feature engineering? Can you give an example of a feature you created that significantly improved a model?",
-            "Tell me about your experience with deep learning frameworks like PyTorch or TensorFlow.",
-            "How do you diagnose and fix a neural network that is suffering from vanishing or exploding gradients?",
-            "Can you explain the trade-offs between using a complex ensemble model versus a simpler, interpretable model?",
-            "Walk me through implementing a convolutional neural network — how do you decide on architecture and hyperparameters?",
-            "How do you handle time-series data in machine learning, and what pitfalls have you encountered?",
-            "Tell me about your experience with transfer learning — when does it work well and when does it fail?",
-            "How do you approach model interpretability? What tools do you use to explain model decisions?",
-            "Can you explain how attention mechanisms work and why they've become so important?",
-            "Walk me through your hyperparameter tuning workflow — what strategies have worked best for you?",
-            "How do you evaluate a model's performance beyond just accuracy — precision, recall, F1, AUC?",
-        ],
-        "advanced": [
-            "How do you go about optimizing a large-scale machine learning model to reduce its inference latency in production?",
-            "Walk me through your experience with distributed training across multiple GPUs or nodes.",
-            "Tell me about a time you had to implement a custom loss function or neural network architecture from scratch.",
-            "How do you approach continual learning or handling concept drift in models that have been in production for a while?",
-            "Explain your strategy for compressing models, using techniques like quantization or pruning, for edge devices.",
-            "How do you design ML systems that need to handle real-time predictions at scale?",
-            "Tell me about your experience with self-supervised or contrastive learning approaches.",
-            "Walk me through building a recommendation system — collaborative filtering vs content-based vs hybrid.",
-            "How do you handle multi-task learning when you need one model to solve multiple related problems?",
-            "Can you explain the mechanics of gradient accumulation and mixed-precision training?",
-            "How do you approach debugging a model that performs well on metrics but fails in real-world deployment?",
-            "Tell me about designing an ML pipeline that needs to retrain automatically when performance degrades.",
-        ],
-    },
-    "gen_ai_engineer": {
-        "beginner": [
-            "Can you walk me through how you typically integrate a Large Language Model API, like OpenAI's, into a basic application?",
-            "How do you approach writing and structuring prompts to get reliable outputs from an LLM?",
-            "Explain what vector embeddings are and how you've used them in your projects.",
-            "What's your strategy for handling token limits and context window restrictions?",
-            "Tell me about a basic chatbot or generative application you've built recently.",
-            "How do you handle API rate limits and errors when working with LLM providers?",
-            "Can you explain the difference between zero-shot, few-shot, and fine-tuned approaches?",
-            "What's your approach to choosing between different LLM providers for a project?",
-            "Tell me about your experience with vector databases like Pinecone, Weaviate, or ChromaDB.",
-            "How do you test the quality and consistency of LLM outputs?",
-            "What security concerns do you think about when building LLM-powered applications?",
-            "Walk me through building a simple question-answering system over a set of documents.",
-        ],
-        "intermediate": [
-            "Walk me through the architecture of a Retrieval-Augmented Generation, or RAG, pipeline you've built.",
-            "How do you evaluate the quality and accuracy of the responses generated by an LLM?",
-            "Can you explain your approach to document chunking and indexing for semantic search?",
-            "Tell me about your experience with fine-tuning open-source models versus using prompt engineering.",
-            "How do you handle hallucinations in generative models to ensure users get factual information?",
-            "Walk me through implementing a conversational AI system with memory that persists across sessions.",
-            "How do you approach prompt injection attacks and security in LLM-powered apps?",
-            "Tell me about your experience with function calling or tool use with LLMs.",
-            "How do you handle multi-modal inputs — text plus images or documents — in your AI applications?",
-            "Can you explain your approach to evaluating RAG pipeline quality — metrics like faithfulness and relevancy?",
-            "How do you optimize LLM costs in production — caching, model routing, prompt optimization?",
-            "Walk me through building a structured data extraction pipeline using LLMs.",
-        ],
-        "advanced": [
-            "Walk me through how you design and implement autonomous AI agents using frameworks like LangChain or AutoGen.",
-            "How do you optimize a RAG pipeline for complex queries, involving techniques like query routing or re-ranking?",
-            "Tell me about a time you had to deploy and serve a large open-weight model, like LLaMA, on your own infrastructure.",
-            "How do you approach building robust memory systems for AI agents that need to maintain context over long periods?",
-            "Explain your strategy for building multimodal generative systems that process both text and images.",
-            "How do you implement reliable AI agent workflows with error recovery and human-in-the-loop escalation?",
-            "Walk me through designing a multi-agent system where different AI agents collaborate to solve complex tasks.",
-            "How do you approach model distillation — training a smaller model to replicate a larger one's behavior?",
-            "Tell me about building evaluation pipelines for LLM applications — automated testing at scale.",
-            "How do you handle compliance and data privacy concerns when building enterprise GenAI solutions?",
-            "Walk me through implementing streaming responses and real-time token generation in production.",
-            "How do you design AI systems that gracefully degrade when the underlying model is unavailable or rate-limited?",
-        ],
-    },
-    "mlops_engineer": {
-        "beginner": [
-            "How do you typically handle version control for your datasets and machine learning models?",
-            "Can you walk me through the basic steps of taking a trained model and wrapping it in a Flask or FastAPI endpoint?",
-            "What tools do you prefer for tracking model experiments and hyperparameters?",
-            "How do you use Docker in the context of deploying machine learning models?",
-            "Tell me about your approach to writing tests for machine learning code.",
-            "What's the difference between model training and model serving, and what challenges does each present?",
-            "How do you handle large dataset storage and versioning in your projects?",
-            "Can you explain what a model registry is and how you'd use one?",
-            "Tell me about your experience with basic cloud services for ML — like SageMaker, Vertex AI, or Azure ML.",
-            "How do you monitor a deployed model's basic health — is it responding? Is it fast enough?",
-            "What's your approach to reproducibility in machine learning experiments?",
-            "How do you handle environment management — different Python versions, dependencies, CUDA versions?",
-        ],
-        "intermediate": [
-            "Walk me through how you set up a CI/CD pipeline specifically tailored for machine learning models.",
-            "How do you monitor models in production to detect data drift or model degradation over time?",
-            "Can you explain the concept of a Feature Store and how you would implement one?",
-            "Tell me about your experience with orchestrating ML workflows using tools like Apache Airflow or Kubeflow.",
-            "How do you manage the infrastructure scaling when your model endpoint receives sudden spikes in traffic?",
-            "Walk me through implementing A/B testing for machine learning models in production.",
-            "How do you handle model rollback when a newly deployed model performs worse than the previous version?",
-            "Tell me about your experience with GPU resource management and optimization.",
-            "How do you implement automated data quality checks in your ML pipelines?",
-            "Can you explain how you'd set up comprehensive model monitoring — performance, fairness, and data quality?",
-            "What's your approach to managing ML pipeline dependencies and ensuring reproducible builds?",
-            "How do you handle secrets and credentials in ML pipeline configurations?",
-        ],
-        "advanced": [
-            "Walk me through the architecture of a fully automated model retraining and deployment pipeline.",
-            "How do you handle A/B testing or shadow deployments for evaluating new machine learning models in production?",
-            "Tell me about a time you had to optimize model serving infrastructure to achieve ultra-low latency.",
-            "How do you ensure compliance, governance, and auditability of models deployed in an enterprise environment?",
-            "Explain your strategy for managing GPU resources effectively across a large team of data scientists.",
-            "How do you design a platform that allows data scientists to deploy models without DevOps knowledge?",
-            "Walk me through implementing online learning or streaming model updates in production.",
-            "How do you handle multi-model serving — routing different requests to different model versions?",
-            "Tell me about your experience with edge deployment — getting ML models running on mobile or IoT devices.",
-            "How do you approach cost optimization for ML infrastructure at scale?",
-            "Walk me through designing a model marketplace or model-as-a-service platform.",
-            "How do you implement comprehensive lineage tracking from raw data to model predictions?",
-        ],
-    },
-    "data_engineer": {
-        "beginner": [
-            "Can you walk me through the basic steps of building an ETL pipeline?",
-            "How do you decide between using a relational database versus a document store for a new dataset?",
-            "Tell me about your experience writing complex SQL queries. What are some functions you use frequently?",
-            "How do you approach cleaning and transforming messy data before it goes into a warehouse?",
-            "What tools do you typically use to schedule and monitor your data jobs?",
-            "Can you explain the difference between OLTP and OLAP systems?",
-            "How do you handle duplicate records in your data pipelines?",
-            "Tell me about your experience with data serialization formats — JSON, Parquet, Avro.",
-            "What's your approach to documenting data pipelines and data dictionaries?",
-            "How do you handle slowly changing dimensions in your data warehouse?",
-            "Can you explain what partitioning is and when you'd use it?",
-            "Tell me about a data quality issue you discovered and how you fixed it.",
-        ],
-        "intermediate": [
-            "Walk me through a scenario where you had to optimize a slow-running data pipeline or database query.",
-            "How do you design a data warehouse schema? Do you prefer star schema, snowflake, or another approach?",
-            "Can you explain the difference between batch processing and stream processing, and when you would use each?",
-            "Tell me about your experience with distributed data processing frameworks like Apache Spark.",
-            "How do you ensure data quality and handle pipeline failures gracefully?",
-            "Walk me through implementing change data capture for real-time data synchronization.",
-            "How do you handle schema evolution when upstream data sources change their format?",
-            "Tell me about your experience with data orchestration tools like Airflow or Dagster.",
-            "How do you approach testing data pipelines — unit tests, integration tests, data validation?",
-            "Can you explain how you'd implement exactly-once processing semantics in a streaming pipeline?",
-            "How do you handle backfilling historical data when a new pipeline is introduced?",
-            "What's your approach to managing data pipeline dependencies and preventing cascade failures?",
-        ],
-        "advanced": [
-            "Walk me through how you would architect a real-time data lakehouse to handle petabytes of data.",
-            "How do you approach data governance, security, and access control in a large organization?",
-            "Tell me about a time you had to migrate a massive amount of data between different cloud providers or database systems.",
-            "How do you design idempotent data pipelines that can recover from complex failure states without duplicating data?",
-            "Explain your strategy for optimizing cloud computing costs associated with large-scale data processing.",
-            "How do you implement data mesh architecture — domain-oriented data ownership and data products?",
-            "Walk me through designing a unified batch and streaming architecture using a framework like Apache Flink.",
-            "How do you handle compliance requirements like GDPR right-to-be-forgotten across distributed data systems?",
-            "Tell me about your experience with query federation — querying across multiple heterogeneous data sources.",
-            "How do you approach capacity planning for data infrastructure that needs to scale 10x over the next year?",
-            "Walk me through implementing a data quality framework with automated anomaly detection.",
-            "How do you design a self-service data platform that empowers analysts while maintaining governance?",
-        ],
-    },
-    "data_scientist": {
-        "beginner": [
-            "Walk me through your typical process for exploratory data analysis when you get a brand new dataset.",
-            "How do you identify and handle missing values or outliers in your data?",
-            "Can you explain the difference between correlation and causation?",
-            "Tell me about your approach to creating clear and actionable data visualizations.",
-            "What statistical tests do you find yourself using most often in your day-to-day work?",
-            "How do you explain the concept of p-values and statistical significance to non-technical people?",
-            "Can you walk me through a basic linear regression and how you interpret the coefficients?",
-            "Tell me about your experience with Python libraries like pandas, NumPy, and matplotlib.",
-            "How do you approach sampling when dealing with very large datasets?",
-            "What's the difference between a Type 1 and Type 2 error, and why does it matter?",
-            "How do you present data findings to a business audience?",
-            "Tell me about a time you used data to influence a business decision.",
-        ],
-        "intermediate": [
-            "Walk me through a time you designed and analyzed an A/B test. How did you determine statistical significance?",
-            "How do you approach dimensionality reduction when working with datasets that have hundreds of features?",
-            "Tell me about a complex predictive model you built. How did you select the features and validate the results?",
-            "How do you handle situations where the data you need to solve a business problem isn't readily available?",
-            "Can you explain how you communicate highly technical statistical findings to non-technical stakeholders?",
-            "Walk me through your approach to time-series forecasting — what methods and validation techniques do you use?",
-            "How do you handle multi-collinearity in your models, and how do you detect it?",
-            "Tell me about your experience with Bayesian statistics versus frequentist approaches.",
-            "How do you design experiments when randomization isn't possible — quasi-experimental methods?",
-            "Can you explain how you approach model selection — balancing complexity with interpretability?",
-            "How do you quantify the business impact of your models and analyses?",
-            "Tell me about implementing a customer segmentation analysis — methodology and business application.",
-        ],
-        "advanced": [
-            "Walk me through your experience with causal inference techniques to determine the true impact of a business intervention.",
-            "How do you design complex experiments when standard A/B testing is not feasible due to network effects or interference?",
-            "Tell me about a time you had to use advanced statistical modeling, like Bayesian networks or Markov chains, to solve a problem.",
-            "How do you quantify and communicate the uncertainty or confidence intervals of your model predictions?",
-            "Explain your strategy for bridging the gap between a prototype analytical model and a scalable production system.",
-            "Walk me through implementing a propensity score matching analysis — when is it appropriate and what are its limitations?",
-            "How do you handle survival analysis problems — customer churn prediction with censored data?",
-            "Tell me about building recommendation systems at scale — algorithmic approaches and evaluation metrics.",
-            "How do you approach multi-armed bandit problems as an alternative to traditional A/B testing?",
-            "Can you explain your experience with graph analytics or network analysis for business problems?",
-            "How do you design fair and unbiased ML models — what techniques do you use to measure and mitigate bias?",
-            "Walk me through a scenario where you had to combine multiple data sources with different granularities for analysis.",
-        ],
-    }
-}
-
-def get_questions_for_interview(interview_type, difficulty_level):
-    """Get the question bank for the given type and level."""
-    normalized_type = {
-        "data-science": "data_scientist",
-        "data_science": "data_scientist",
-        "ai-ml-engineer": "ai_ml_engineer",
-        "gen-ai-engineer": "gen_ai_engineer",
-        "mlops-engineer": "mlops_engineer",
-        "data-engineer": "data_engineer",
-    }.get(interview_type, interview_type)
-    type_questions = QUESTION_BANKS.get(normalized_type, QUESTION_BANKS["fullstack"])
-    return type_questions.get(difficulty_level, type_questions["intermediate"])
-
-
-def get_progressive_questions(interview_type, difficulty_level):
-    """Start with fundamentals, then gradually increase depth."""
-    normalized_type = {
-        "data-science": "data_scientist",
-        "data_science": "data_scientist",
-        "ai-ml-engineer": "ai_ml_engineer",
-        "gen-ai-engineer": "gen_ai_engineer",
-        "mlops-engineer": "mlops_engineer",
-        "data-engineer": "data_engineer",
-    }.get(interview_type, interview_type)
-
-    banks = QUESTION_BANKS.get(normalized_type, QUESTION_BANKS["fullstack"])
-
-    if difficulty_level == "beginner":
-        return banks["beginner"]
-    if difficulty_level == "intermediate":
-        return banks["beginner"][:3] + banks["intermediate"][:6]
-    if difficulty_level == "advanced":
-        return banks["beginner"][:2] + banks["intermediate"][:3] + banks["advanced"][:6]
-
-    return banks["intermediate"]
-
 
+# Budgets cap per-session usage (LLM tokens incl. live scoring, billed STT
+# seconds, TTS characters); the agent starts wrapping up as they run low.
 DURATION_CONFIG = {
     "quick": {
         "minutes": 8,
         "questions": 6,
         "followup_depth": 1,
+        "budget": {"llm_tokens": 100_000, "stt_seconds": 600, "tts_characters": 4_000},
     },
     "standard": {
         "minutes": 15,
         "questions": 9,
         "followup_depth": 2,
+        "budget": {"llm_tokens": 220_000, "stt_seconds": 1_020, "tts_characters": 7_000},
     },
     "deep": {
         "minutes": 25,
         "questions": 14,
         "followup_depth": 3,
+        "budget": {"llm_tokens": 450_000, "stt_seconds": 1_620, "tts_characters": 11_000},
     },
 }
 
+BUDGET_SECTIONS = {
+    BUDGET_TIGHT: """
 
-# Field-specific interviewer personas and focus areas
-INTERVIEWER_PERSONAS = {
-    "frontend": {
-        "persona": "a Senior Frontend Architect who has built large-scale web applications at companies like Stripe and Vercel",
-        "focus": "UI/UX thinking, component architecture, performance optimization, accessibility, and user experience intuition",
-        "eval_style": "Pay attention to whether they think about the end user. Do they consider edge cases in the UI? Do they think about responsive design naturally? Evaluate their CSS and JavaScript fundamentals deeply.",
-        "red_flags": "Watch for candidates who only know framework APIs but can't explain underlying browser concepts, or those who ignore accessibility and performance.",
-    },
-    "backend": {
-        "persona": "a Principal Backend Engineer who has designed systems handling millions of requests per second at scale",
-        "focus": "system design thinking, database expertise, API design principles, error handling philosophy, and scalability awareness",
-        "eval_style": "Focus on whether they think about edge cases, failure modes, and data consistency. Do they consider security from the start? Can they reason about system bottlenecks?",
-        "red_flags": "Watch for candidates who can't explain the trade-offs of their database choices, or who don't think about error handling and monitoring.",
-    },
-    "fullstack": {
-        "persona": "a Tech Lead who has shipped end-to-end products from zero to millions of users",
-        "focus": "end-to-end system thinking, integration patterns, deployment strategies, and the ability to context-switch between frontend and backend concerns",
-        "eval_style": "Evaluate their ability to think holistically. Can they trace a user action from the UI through the API to the database? Do they understand how frontend and backend decisions impact each other?",
-        "red_flags": "Watch for candidates who are strong on one side but completely weak on the other, or who can't explain how data flows through their applications.",
-    },
-    "devops": {
-        "persona": "a Staff Site Reliability Engineer who has managed production infrastructure for high-traffic systems",
-        "focus": "infrastructure automation, reliability engineering, monitoring philosophy, incident response, and cost optimization",
-        "eval_style": "Focus on their operational thinking. Do they consider what happens when things fail? Can they explain their monitoring and alerting strategy? Do they think about security and compliance?",
-        "red_flags": "Watch for candidates who only know tools but can't explain the principles behind them, or who don't think about failure scenarios and recovery.",
-    },
-    "ai_ml_engineer": {
-        "persona": "a Lead ML Engineer who has deployed production ML systems that serve real-time predictions at scale",
-        "focus": "model development lifecycle, data quality awareness, experiment design, production ML challenges, and mathematical foundations",
-        "eval_style": "Evaluate their understanding of the full ML lifecycle — not just model training. Do they think about data quality? Can they explain their model choices mathematically? Do they consider production deployment challenges?",
-        "red_flags": "Watch for candidates who can only call sklearn APIs but can't explain bias-variance tradeoff, or who never think about how their models will perform on real-world data.",
-    },
-    "gen_ai_engineer": {
-        "persona": "a GenAI Lead who has built production LLM applications including RAG systems, AI agents, and enterprise chatbots",
-        "focus": "LLM application architecture, prompt engineering depth, retrieval systems, evaluation methodology, and responsible AI practices",
-        "eval_style": "Focus on whether they understand the limitations of LLMs. Can they design robust systems that handle hallucinations? Do they think about evaluation beyond just vibes? Do they consider cost, latency, and safety?",
-        "red_flags": "Watch for candidates who only know how to call OpenAI APIs but can't design a robust production system, or who don't think about evaluation and testing.",
-    },
-    "mlops_engineer": {
-        "persona": "a Head of ML Platform who has built internal ML platforms serving hundreds of data scientists",
-        "focus": "ML pipeline automation, model monitoring, infrastructure management, reproducibility, and platform thinking",
-        "eval_style": "Evaluate their ability to think about the platform holistically. Can they design systems that other data scientists can use? Do they understand model drift and monitoring? Can they manage complex dependencies?",
-        "red_flags": "Watch for candidates who only focus on model training but ignore the operational aspects, or who can't explain how they'd handle model rollback or A/B testing.",
-    },
-    "data_engineer": {
-        "persona": "a Principal Data Engineer who has built data platforms processing petabytes of data for analytics and ML",
-        "focus": "data pipeline architecture, data quality engineering, performance optimization, schema design, and data governance",
-        "eval_style": "Focus on their understanding of data at scale. Do they think about data quality proactively? Can they design efficient pipelines that handle failures gracefully? Do they understand the differences between batch and streaming?",
-        "red_flags": "Watch for candidates who can write SQL but can't design data models, or who don't think about data quality, lineage, and governance.",
-    },
-    "data_scientist": {
-        "persona": "a Director of Data Science who has led teams that drove major business decisions through statistical analysis and modeling",
-        "focus": "statistical rigor, business impact thinking, experiment design, communication of results, and practical modeling skills",
-        "eval_style": "Focus on whether they can connect data to business outcomes. Do they think about statistical validity? Can they design proper experiments? Can they communicate findings clearly to non-technical stakeholders?",
-        "red_flags": "Watch for candidates who focus purely on algorithms without understanding the business context, or who can't explain their statistical methodology rigorously.",
-    },
+BUDGET NOTICE — SESSION RUNNING LOW:
+- Keep every reaction to one short sentence.
+- Do not ask any more follow-up questions.
+- Ask at most one more main question, then move to the conclusion.""",
+    BUDGET_EXHAUSTED: """
+
+BUDGET NOTICE — SESSION LIMIT REACHED:
+- Do not ask any more questions.
+- Conclude the interview now with one strength and one area to explore further.""",
 }
 
 
+def get_questions_for_interview(interview_type, difficulty_level):
+    """Get the question bank for the given type and level."""
+    return get_content().questions_for_interview(interview_type, difficulty_level)
+
+
+def get_progressive_questions(interview_type, difficulty_level):
+    """Start with fundamentals, then gradually increase depth."""
+    return get_content().progressive_questions(interview_type, difficulty_level)
+
+
+_shared_vad = {"model": None}
+_shared_vad_lock = threading.Lock()
+
+
+def get_shared_vad():
+    """Load the Silero VAD model once per process and share it across sessions."""
+    with _shared_vad_lock:
+        if _shared_vad["model"] is None:
+            _shared_vad["model"] = silero.VAD.load()
+        return _shared_vad["model"]
+
+
+def build_providers():
+    """Create the live LLM, STT, TTS and VAD providers for one session."""
+    return {
+        "llm": openai.LLM.with_cerebras(model="gpt-oss-120b"),
+        "stt": deepgram.STT(),
+        "tts": deepgram.TTS(),
+        "vad": get_shared_vad(),
+    }
+
+
+def open_connections(providers):
+    """Start connecting the providers on the running loop without waiting.
+
+    Provider connections belong to the job's event loop, so they are opened at
+    job start, overlapping the room connection and metadata wait. Plugins with
+    nothing to warm up (per-stream Deepgram STT sockets) implement prewarm()
+    as a no-op.
+    """
+    for key in ("tts", "llm", "stt"):
+        prewarm = getattr(providers.get(key), "prewarm", None)
+        if prewarm is not None:
+            prewarm()
+
+
+def prewarm(proc: JobProcess):
+    """Load shared models before the process accepts its first job."""
+    proc.userdata["vad"] = get_shared_vad()
+    get_content()
+
+
 class InterviewerAgent(Agent):
     def __init__(self, interview_type="fullstack", difficulty_level="intermediate",
                  interview_id=None, user_name="Candidate", max_questions=8,
                  followup_depth=2, target_minutes=15, candidate_level="student",
-                 resume_text="", job_description="", coach_mode=False):
+                 resume_text="", job_description="", coach_mode=False,
+                 providers=None, content=None):
         self.interview_type = interview_type
         self.difficulty_level = difficulty_level
         self.interview_id = interview_id
@@ -561,13 +166,13 @@ class InterviewerAgent(Agent):
         self.start_time = time.time()
         self.coach_mode = coach_mode
 
-        questions = get_progressive_questions(interview_type, difficulty_level)
-        questions_text = json.dumps(questions, indent=2)
+        # Pin the content version for the whole session
+        self.content = content or get_content()
+        questions_text = self.content.question_bank_text(interview_type, difficulty_level)
 
-        llm = openai.LLM.with_cerebras(model="gpt-oss-120b")
-        stt = deepgram.STT()
-        tts = deepgram.TTS()
-        vad = silero.VAD.load()
+        # Providers can be injected (e.g. stand-ins when replaying a recording)
+        if providers is None:
+            providers = build_providers()
 
         # Build context sections for resume and job description
         resume_section = ""
@@ -613,7 +218,7 @@ RESUME + JOB DESCRIPTION CROSS-ANALYSIS:
 - Focus 60% of questions on JD-relevant topics, 30% on resume-specific deep-dives, and 10% on general behavioral questions."""
 
         # Get field-specific persona
-        persona_data = INTERVIEWER_PERSONAS.get(interview_type, INTERVIEWER_PERSONAS["fullstack"])
+        persona_data = self.content.persona(interview_type)
 
         # Build coach mode section
         coach_section = ""
@@ -723,48 +328,189 @@ CONCLUSION:
 - Tell them their detailed feedback with scores will be available on their dashboard shortly.
 {student_section}{coach_section}"""
 
+        self.base_instructions = instructions
+        self.budget_level = BUDGET_OK
+
         super().__init__(
             instructions=instructions,
-            stt=stt, llm=llm, tts=tts, vad=vad
+            stt=providers["stt"], llm=providers["llm"],
+            tts=providers["tts"], vad=providers["vad"],
         )
 
     def get_elapsed_minutes(self):
         return (time.time() - self.start_time) / 60
 
+    async def apply_budget_level(self, level):
+        """Tighten the interview as the session approaches its usage budget."""
+        if level == self.budget_level or level == BUDGET_OK:
+            return
+        self.budget_level = level
+        print(f"Session budget {level}, shortening interview {self.interview_id}", flush=True)
+        await self.update_instructions(self.base_instructions + BUDGET_SECTIONS[level])
+        if level == BUDGET_EXHAUSTED:
+            self.session.generate_reply(
+                instructions="Conclude the interview now: thank the candidate, mention one strength and one area to explore further, and say goodbye."
+            )
+
     async def on_enter(self):
+        # instructions=, not user_input=: a user_input prompt is added to the chat
+        # as a user message and would be collected as the candidate's first turn
         self.session.generate_reply(
-            user_input=f"Start the interview with a brief greeting and one-sentence introduction. Then ask exactly this one question: Could you briefly introduce yourself?"
+            instructions=f"Start the interview with a brief greeting and one-sentence introduction. Then ask exactly this one question: Could you briefly introduce yourself?"
         )
-async def save_interview_results(interview_id, transcript_data, backend_url, api_key):
-    """Post interview results back to the Node.js backend."""
+def get_agent_config(metadata):
+    """Map room/participant metadata to InterviewerAgent keyword arguments."""
+    duration = metadata.get("duration", "standard")
+    duration_config = DURATION_CONFIG.get(duration, DURATION_CONFIG["standard"])
+    return {
+        "interview_type": metadata.get("interviewType", "fullstack"),
+        "difficulty_level": metadata.get("difficultyLevel", "intermediate"),
+        "interview_id": metadata.get("interviewId", None),
+        "user_name": metadata.get("userName", "Candidate"),
+        "max_questions": metadata.get("maxQuestions", duration_config["questions"]),
+        "followup_depth": metadata.get("followupDepth", duration_config["followup_depth"]),
+        "target_minutes": metadata.get("targetMinutes", duration_config["minutes"]),
+        "candidate_level": metadata.get("candidateLevel", "student"),
+        "resume_text": metadata.get("resumeText", ""),
+        "job_description": metadata.get("jobDescription", ""),
+        "coach_mode": metadata.get("coachMode", False),
+    }
+
+
+async def save_interview_results(interview_id, envelope, backend_url, api_key):
+    """Post the result envelope back to the Node.js backend.
+
+    Connection errors, timeouts and 5xx/429 responses are retried with
+    backoff, or after the response's Retry-After (sent while the backend is
+    still processing an earlier attempt); the envelope's idempotency key makes
+    the retries safe.
+    """
     if not interview_id or not backend_url:
         print("No interview ID or backend URL, skipping save.")
         return
 
     url = f"{backend_url}/api/interview/{interview_id}/save-live-results"
-    headers = {
-        "Content-Type": "application/json",
-        "x-agent-api-key": api_key or "",
-    }
+    body, headers = encode_envelope(envelope)
+    headers["x-agent-api-key"] = api_key or ""
+    print(f"Uploading results for {interview_id}: {len(body)} bytes (schema v{envelope['schemaVersion']})", flush=True)
 
+    METRICS.add_gauge("pending_uploads", 1)
+    started = time.monotonic()
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=transcript_data, headers=headers) as resp:
-                if resp.status == 200:
-                    print(f"Interview results saved for {interview_id}")
-                else:
-                    text = await resp.text()
-                    print(f"Failed to save results: {resp.status} - {text}")
+        timeout = aiohttp.ClientTimeout(total=UPLOAD_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            for attempt in range(1, UPLOAD_ATTEMPTS + 1):
+                delay = 2 ** (attempt - 1)
+                try:
+                    async with session.post(url, data=body, headers=headers) as resp:
+                        if resp.status == 200:
+                            print(f"Interview results saved for {interview_id}")
+                            return
+                        text = await resp.text()
+                        print(f"Failed to save results (attempt {attempt}): {resp.status} - {text}")
+                        if resp.status < 500 and resp.status != 429:
+                            return
+                        retry_after = resp.headers.get("Retry-After", "")
+                        if retry_after.isdigit():
+                            delay = min(int(retry_after), UPLOAD_MAX_RETRY_AFTER)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"Error saving interview results (attempt {attempt}): {e!r}")
+                if attempt < UPLOAD_ATTEMPTS:
+                    await asyncio.sleep(delay)
     except Exception as e:
         print(f"Error saving interview results: {e}")
+    finally:
+        METRICS.add_gauge("pending_uploads", -1)
+        METRICS.observe("upload", time.monotonic() - started)
+
+
+async def request_fnc(req: JobRequest):
+    """Accept jobs unless this worker already has MAX_CONCURRENT_SESSIONS unfinished jobs.
+
+    Jobs count from the moment they are accepted, not once their session has
+    started, so a burst of requests cannot overshoot the limit.
+    """
+    if MAX_CONCURRENT_SESSIONS > 0:
+        admitted = admitted_jobs()
+        if admitted >= MAX_CONCURRENT_SESSIONS:
+            METRICS.inc("jobs_rejected")
+            print(f"Rejecting job {req.id}: {admitted} unfinished jobs", flush=True)
+            await req.reject()
+            return
+    METRICS.inc("jobs_accepted")
+    admit_job(req.id)
+    await req.accept()
+
+
+_default_load_fnc = WorkerOptions.load_fnc
+
+
+def worker_load(worker):
+    """LiveKit's default CPU load. The worker loop calls this every 0.5s, so
+    each call doubles as the liveness beat behind /healthz.
+
+    The first call also starts the metrics server, so it runs in the worker's
+    own process in both start and dev mode.
+    """
+    note_worker_alive(worker)
+    start_metrics_server()
+    return _default_load_fnc(worker)
 
 
 async def entrypoint(ctx: JobContext):
+    """Run one interview, containing its failure to this session."""
+    state = {"active": False, "recorder": None, "scorer": None,
+             "analytics": None, "audio_tasks": [], "analytics_tasks": []}
+    try:
+        await run_interview(ctx, state)
+    except Exception:
+        METRICS.inc("sessions_failed")
+        if state["active"]:
+            METRICS.add_gauge("active_sessions", -1)
+        get_watchdog().end_session(ctx.room.name)
+        print(f"Interview session in room {ctx.room.name} failed:", file=sys.stderr, flush=True)
+        traceback.print_exc()
+    finally:
+        # A no-op once the scorer has been finalized
+        if state["scorer"]:
+            state["scorer"].close()
+        await release_speech_analytics(state)
+        # Finalize the recording even when the session failed, so it can be replayed
+        if state["recorder"]:
+            await asyncio.to_thread(state["recorder"].close)
+
+
+async def release_speech_analytics(state):
+    """Stop feeding candidate audio and shut down the analysis thread (idempotent)."""
+    analytics = state["analytics"]
+    if analytics is None:
+        return
+    state["analytics"] = None
+    for task in state["audio_tasks"]:
+        task.cancel()
+    await asyncio.gather(*state["audio_tasks"], *state["analytics_tasks"], return_exceptions=True)
+    analytics.close()
+
+
+async def run_interview(ctx, state):
     print("Agent job received. Connecting to LiveKit room...", flush=True)
+    clock = SessionClock()
+    start_job_metrics()
+    watchdog = get_watchdog()
+
+    # Build the providers and open their connections while we join the room.
+    # Loading the VAD model and provider clients blocks; optionally do it off the loop
+    if OFFLOAD_AGENT_SETUP:
+        providers = await asyncio.to_thread(build_providers)
+    else:
+        providers = build_providers()
+    open_connections(providers)
+
     await ctx.connect()
 
     room = ctx.room
     metadata = {}
+    candidate = {"identity": None}
     print(f"Agent connected to room: {room.name}", flush=True)
 
     # 1) Try room-level metadata first
@@ -780,6 +526,7 @@ async def entrypoint(ctx: JobContext):
             try:
                 if participant.metadata:
                     metadata = json.loads(participant.metadata)
+                    candidate["identity"] = participant.identity
                     break
             except (json.JSONDecodeError, TypeError):
                 continue
@@ -792,90 +539,255 @@ async def entrypoint(ctx: JobContext):
                 try:
                     if participant.metadata:
                         metadata = json.loads(participant.metadata)
+                        candidate["identity"] = participant.identity
                         break
                 except (json.JSONDecodeError, TypeError):
                     continue
             if metadata:
                 break
 
-    interview_type = metadata.get("interviewType", "fullstack")
-    difficulty_level = metadata.get("difficultyLevel", "intermediate")
-    interview_id = metadata.get("interviewId", None)
-    user_name = metadata.get("userName", "Candidate")
     duration = metadata.get("duration", "standard")
-    duration_config = DURATION_CONFIG.get(duration, DURATION_CONFIG["standard"])
-    max_questions = metadata.get("maxQuestions", duration_config["questions"])
-    followup_depth = metadata.get("followupDepth", duration_config["followup_depth"])
-    target_minutes = metadata.get("targetMinutes", duration_config["minutes"])
-    candidate_level = metadata.get("candidateLevel", "student")
-    resume_text = metadata.get("resumeText", "")
-    job_description = metadata.get("jobDescription", "")
-    coach_mode = metadata.get("coachMode", False)
+    agent_config = get_agent_config(metadata)
+    interview_type = agent_config["interview_type"]
+    difficulty_level = agent_config["difficulty_level"]
+    interview_id = agent_config["interview_id"]
+    max_questions = agent_config["max_questions"]
+    followup_depth = agent_config["followup_depth"]
+    target_minutes = agent_config["target_minutes"]
+    resume_text = agent_config["resume_text"]
+    job_description = agent_config["job_description"]
+    coach_mode = agent_config["coach_mode"]
+
+    # Optionally record the session event stream for offline replay
+    recorder = None
+    record_dir = os.environ.get("SESSION_RECORD_DIR", "")
+    if record_dir:
+        recorder = SessionRecorder(recording_path(record_dir, interview_id or room.name))
+        recorder.record("metadata", metadata=metadata)
+        state["recorder"] = recorder
+        print(f"Recording session to {recorder.path}", flush=True)
 
     print(f"Starting interview: type={interview_type}, level={difficulty_level}, duration={duration}, target={target_minutes}m, questions={max_questions}, followups={followup_depth}, id={interview_id}, resume={'yes' if resume_text else 'no'}, jd={'yes' if job_description else 'no'}, coach={'yes' if coach_mode else 'no'}", flush=True)
 
-    agent = InterviewerAgent(
-        interview_type=interview_type,
-        difficulty_level=difficulty_level,
-        interview_id=interview_id,
-        user_name=user_name,
-        max_questions=max_questions,
-        followup_depth=followup_depth,
-        target_minutes=target_minutes,
-        candidate_level=candidate_level,
-        resume_text=resume_text,
-        job_description=job_description,
-        coach_mode=coach_mode,
-    )
+    watchdog.begin_session(room.name)
+
+    # Pick up edited question banks/personas; this session keeps this version
+    content = await asyncio.to_thread(refresh_content)
+    print(f"Using interview content v{content.version}", flush=True)
+
+    agent = InterviewerAgent(**agent_config, providers=providers, content=content)
 
     session = AgentSession()
 
+    # Meter provider usage and wrap up early as the session nears its budget
+    usage = UsageMeter()
+    budget = DURATION_CONFIG.get(duration, DURATION_CONFIG["standard"])["budget"]
+
+    budget_task = {"task": None}
+
+    def on_budget_applied(task):
+        if not task.cancelled() and task.exception():
+            print(f"Failed to apply session budget level: {task.exception()!r}", file=sys.stderr, flush=True)
+
+    def check_budget():
+        level = usage.budget_level(budget)
+        if level == agent.budget_level or level == BUDGET_OK:
+            return
+        # One change at a time; the next metrics event re-checks once it is done
+        if budget_task["task"] and not budget_task["task"].done():
+            return
+        budget_task["task"] = asyncio.create_task(agent.apply_budget_level(level))
+        budget_task["task"].add_done_callback(on_budget_applied)
+
+    @session.on("metrics_collected")
+    def on_metrics_collected(ev):
+        usage.add_metrics(ev.metrics)
+        METRICS.observe_provider_metrics(ev.metrics)
+        check_budget()
+        if recorder:
+            recorder.record_metrics(ev.metrics)
+
+    # Score answers in the background so results are ready at hang-up
+    def on_scoring_usage(prompt_tokens, completion_tokens):
+        usage.add_llm_usage(prompt_tokens, completion_tokens)
+        check_budget()
+
+    scorer = LiveScorer(
+        agent.content.persona(interview_type), interview_type, difficulty_level,
+        analysis_type=metadata.get("analysisType", "basic"), on_usage=on_scoring_usage,
+    )
+    scorer.start()
+    state["scorer"] = scorer
+
+    # Per-answer pace, pause and energy statistics from the candidate's audio
+    analytics = SpeechAnalytics() if SPEECH_ANALYTICS_ENABLED else None
+    state["analytics"] = analytics
+    audio_tasks = state["audio_tasks"]
+    analytics_tasks = state["analytics_tasks"]
+
+    async def feed_speech_analytics(track):
+        stream = rtc.AudioStream(track, sample_rate=SAMPLE_RATE, num_channels=1)
+        try:
+            async for ev in stream:
+                analytics.push_frame(ev.frame.data)
+        finally:
+            await stream.aclose()
+
+    def watch_audio_track(track, publication, participant):
+        # Only the candidate's microphone: any other audio would inflate the
+        # speaking time and split the candidate's pauses
+        if not analytics or track.kind != rtc.TrackKind.KIND_AUDIO:
+            return
+        if publication.source != rtc.TrackSource.SOURCE_MICROPHONE:
+            return
+        if participant.kind != rtc.ParticipantKind.PARTICIPANT_KIND_STANDARD:
+            return
+        if candidate["identity"] is None:
+            candidate["identity"] = participant.identity
+        if participant.identity == candidate["identity"]:
+            audio_tasks.append(asyncio.create_task(feed_speech_analytics(track)))
+
+    @room.on("track_subscribed")
+    def on_track_subscribed(track, publication, participant):
+        watch_audio_track(track, publication, participant)
+
+    # Tracks subscribed while we were waiting for metadata
+    for participant in room.remote_participants.values():
+        for publication in participant.track_publications.values():
+            if publication.track:
+                watch_audio_track(publication.track, publication, participant)
+
+    async def attach_speech_analytics(entry, text):
+        stats = await asyncio.wrap_future(analytics.end_answer(len(text.split())))
+        entry["speechAnalytics"] = stats
+        if recorder:
+            recorder.record("speech_analytics", **stats)
+
     # Collect transcript for saving
     transcript_entries = []
 
-    @session.on("agent_speech_committed")
-    def on_agent_speech(msg):
+    def on_agent_speech(text):
         transcript_entries.append({
             "role": "interviewer",
-            "text": msg.content if hasattr(msg, 'content') else str(msg),
-            "timestamp": asyncio.get_event_loop().time(),
+            "text": text,
+            "timestamp": time.monotonic(),
         })
-
-    @session.on("user_speech_committed")
-    def on_user_speech(msg):
-        transcript_entries.append({
+        scorer.add_entry("interviewer", text)
+        if analytics:
+            analytics.start_answer()
+        if recorder:
+            recorder.record("speech", role="interviewer", text=text)
+
+    def on_user_speech(text):
+        entry = {
             "role": "candidate",
-            "text": msg.content if hasattr(msg, 'content') else str(msg),
-            "timestamp": asyncio.get_event_loop().time(),
-        })
+            "text": text,
+            "timestamp": time.monotonic(),
+        }
+        transcript_entries.append(entry)
+        scorer.add_entry("candidate", text)
+        if analytics:
+            analytics_tasks.append(asyncio.create_task(attach_speech_analytics(entry, text)))
+        if recorder:
+            recorder.record("speech", role="candidate", text=text)
+
+    @session.on("conversation_item_added")
+    def on_conversation_item_added(ev):
+        text = ev.item.text_content
+        if not text:
+            return
+        if ev.item.role == "assistant":
+            on_agent_speech(text)
+        elif ev.item.role == "user":
+            on_user_speech(text)
+
+    first_audio = {"seconds": None}
+
+    @session.on("agent_state_changed")
+    def on_agent_state_changed(ev):
+        if ev.new_state == "speaking" and first_audio["seconds"] is None:
+            first_audio["seconds"] = clock.elapsed()
+            METRICS.observe("time_to_first_audio", first_audio["seconds"], FIRST_AUDIO_BUCKETS)
+            print(f"First interviewer audio {first_audio['seconds']:.2f}s after job start", flush=True)
+
+    candidate_left = asyncio.Event()
+
+    @room.on("participant_disconnected")
+    def on_participant_disconnected(participant):
+        if not room.remote_participants:
+            candidate_left.set()
 
     await session.start(room=room, agent=agent)
+    METRICS.add_gauge("active_sessions", 1)
+    state["active"] = True
 
     # Wait for participant to disconnect or duration-aware timeout.
     session_timeout_seconds = int((target_minutes + 2) * 60)
     try:
-        await asyncio.sleep(session_timeout_seconds)
-    except asyncio.CancelledError:
+        await asyncio.wait_for(candidate_left.wait(), session_timeout_seconds)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
         pass
+    session_ended_at = time.monotonic()
+    clock.finish()
+    METRICS.add_gauge("active_sessions", -1)
+    state["active"] = False
+    METRICS.inc("sessions_completed")
+    loop_health = watchdog.end_session(room.name)
+    process_health = process_summary()
+    print(f"Event loop health: session={loop_health}, process stalls={process_health['stalls']} ({process_health['blockedSeconds']}s blocked)", flush=True)
+    if analytics:
+        await release_speech_analytics(state)
+        print(f"Speech analytics: {len(analytics_tasks)} answer(s), {analytics.dropped_frames} dropped frame(s)", flush=True)
+    if recorder:
+        await asyncio.to_thread(recorder.close)
+
+    score_sheet = await scorer.finalize()
+    results_ready_seconds = time.monotonic() - session_ended_at
+    usage_summary = usage.summary()
+    record_session_usage(usage)
+    print(f"Session usage: {usage_summary}", flush=True)
+    print(f"Live scores ready {results_ready_seconds:.2f}s after session end: {len(score_sheet['scores'])} scored, {score_sheet['stats']['batches']} batch(es), {score_sheet['stats']['llm_seconds']:.1f}s LLM time", flush=True)
 
     # Save results when session ends
     backend_url = os.environ.get("BACKEND_URL", "http://localhost:3000")
     agent_api_key = os.environ.get("AGENT_API_KEY", "")
 
     if interview_id and transcript_entries:
-        await save_interview_results(
+        envelope = build_envelope(
+            new_idempotency_key(interview_id),
+            clock,
+            transcript_entries,
             interview_id,
-            {
-                "transcript": transcript_entries,
-                "interviewType": interview_type,
-                "difficultyLevel": difficulty_level,
+            interview_type,
+            difficulty_level,
+            content_version=agent.content.version,
+            scores=score_sheet["scores"],
+            metrics={
+                "usage": usage_summary,
+                "loopHealth": loop_health,
+                "scoring": {
+                    **score_sheet["stats"],
+                    "readyAfterSeconds": round(results_ready_seconds, 3),
+                },
+                "timeToFirstAudioSeconds": round(first_audio["seconds"], 3) if first_audio["seconds"] is not None else None,
             },
-            backend_url,
-            agent_api_key,
         )
+        await save_interview_results(interview_id, envelope, backend_url, agent_api_key)
+
+    await flush_job_metrics()
 
 if __name__ == "__main__":
     check_environment_vars()
-    opts = WorkerOptions(entrypoint_fnc=entrypoint)
+    executor_type = JobExecutorType.PROCESS
+    if AGENT_EXECUTION_MODE == "multiplexed":
+        executor_type = JobExecutorType.THREAD
+        print("Multiplexed mode: interviews run as threads in the worker process.", flush=True)
+    opts = WorkerOptions(
+        entrypoint_fnc=entrypoint,
+        request_fnc=request_fnc,
+        prewarm_fnc=prewarm,
+        load_fnc=worker_load,
+        job_executor_type=executor_type,
+    )
     print("Starting IntervuAI Agent Worker...", flush=True)
     agents.cli.run_app(opts)
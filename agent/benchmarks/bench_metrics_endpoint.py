@@ -0,0 +1,117 @@
+# Benchmark: cost of scraping the worker metrics endpoint.
+#
+# 1. Render time of /metrics with N job-process snapshots on disk.
+# 2. Jitter of a 20 ms audio-frame loop with and without a scraper hitting
+#    /metrics over HTTP far more often than Prometheus would.
+#
+# Usage: python benchmarks/bench_metrics_endpoint.py [--jobs 16] [--seconds 5]
+
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+import shutil
+import tempfile
+import threading
+import statistics
+import urllib.request
+
+# Always use a private snapshot directory; it is removed when the run ends
+os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="intervuai-metrics-bench-")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from observability import (  # noqa: E402
+    METRICS_DIR, LAG_BUCKETS, MetricsRegistry, render_prometheus, start_metrics_server, write_snapshot,
+)
+
+FRAME_SECONDS = 0.02
+
+
+def make_job_snapshots(count):
+    """Write `count` realistic job snapshots. PID 1 is used so they count as live."""
+    for index in range(count):
+        registry = MetricsRegistry()
+        registry.add_gauge("active_sessions", 1)
+        registry.inc("sessions_completed", index)
+        for i in range(500):
+            registry.observe("llm_ttft", 0.2 + (i % 10) * 0.05)
+            registry.observe("tts_ttfb", 0.1 + (i % 7) * 0.03)
+            registry.observe("eou_delay", 0.4 + (i % 5) * 0.1)
+            registry.observe("loop_lag", (i % 20) * 0.001, LAG_BUCKETS)
+        snapshot = registry.snapshot()
+        snapshot["pid"] = 1
+        write_snapshot(snapshot)
+        os.replace(os.path.join(METRICS_DIR, "1.json"), os.path.join(METRICS_DIR, f"bench-{index}.json"))
+
+
+def bench_render(iterations=500):
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        render_prometheus()
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    return {
+        "mean_ms": round(statistics.mean(durations) * 1000, 3),
+        "p99_ms": round(durations[int(len(durations) * 0.99) - 1] * 1000, 3),
+    }
+
+
+async def frame_jitter(seconds):
+    """Run a 20 ms frame loop and return the jitter distribution in ms."""
+    loop = asyncio.get_running_loop()
+    jitters = []
+    next_tick = loop.time() + FRAME_SECONDS
+    end = loop.time() + seconds
+    while loop.time() < end:
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        jitters.append(max(0.0, loop.time() - next_tick))
+        next_tick += FRAME_SECONDS
+    jitters.sort()
+    return {
+        "p50_ms": round(jitters[len(jitters) // 2] * 1000, 3),
+        "p99_ms": round(jitters[int(len(jitters) * 0.99) - 1] * 1000, 3),
+        "max_ms": round(jitters[-1] * 1000, 3),
+    }
+
+
+def scrape_forever(url, interval, stop, counter):
+    while not stop.is_set():
+        with urllib.request.urlopen(url) as resp:
+            resp.read()
+        counter[0] += 1
+        stop.wait(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=16, help="job-process snapshots on disk")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each jitter run")
+    parser.add_argument("--scrape-interval", type=float, default=0.1, help="seconds between scrapes")
+    parser.add_argument("--port", type=int, default=19100)
+    args = parser.parse_args()
+
+    make_job_snapshots(args.jobs)
+    server = start_metrics_server(args.port)
+    url = f"http://127.0.0.1:{args.port}/metrics"
+
+    report = {"jobs": args.jobs, "render": bench_render()}
+    report["jitter_idle"] = asyncio.run(frame_jitter(args.seconds))
+
+    stop, counter = threading.Event(), [0]
+    scraper = threading.Thread(target=scrape_forever, args=(url, args.scrape_interval, stop, counter), daemon=True)
+    scraper.start()
+    report["jitter_scraping"] = asyncio.run(frame_jitter(args.seconds))
+    stop.set()
+    scraper.join()
+    report["scrapes"] = counter[0]
+    server.shutdown()
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
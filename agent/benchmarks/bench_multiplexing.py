@@ -0,0 +1,112 @@
+# Benchmark: process-per-job vs multiplexed sessions.
+#
+# Replays the same recorded interview N times concurrently and reports RSS per
+# concurrent interview and per-turn agent overhead for each execution mode:
+#
+#   process      N child processes, each loading its own Silero VAD and tables
+#                (what LiveKit's default process executor does)
+#   multiplexed  one child process running N sessions on their own threads and
+#                event loops with a shared VAD, as LiveKit's thread executor runs
+#                them inside the main worker process (AGENT_EXECUTION_MODE=multiplexed)
+#
+# Needs the agent requirements installed and a recording made with
+# SESSION_RECORD_DIR.
+#
+# Usage: python benchmarks/bench_multiplexing.py recordings/<session>.jsonl.gz [--sessions 8] [--speed 4]
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+import threading
+import subprocess
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+
+
+def run_child(mode, recording, sessions, speed):
+    """Child process body: run the sessions and print RSS and turn overheads as JSON."""
+    from observability import process_rss_bytes
+    from replay import replay
+    from app import get_shared_vad
+
+    baseline_rss = process_rss_bytes()
+    vad = get_shared_vad()
+    reports = []
+
+    def run_session():
+        reports.append(asyncio.run(replay(recording, speed, vad=vad)))
+
+    threads = [threading.Thread(target=run_session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps({
+        "mode": mode,
+        "sessions": sessions,
+        "rss_bytes": process_rss_bytes(),
+        "baseline_rss_bytes": baseline_rss,
+        "overheads": [turn["overhead_seconds"] for r in reports for turn in r["turns"]],
+    }))
+
+
+def spawn(mode, recording, sessions, speed):
+    command = [sys.executable, os.path.abspath(__file__), recording,
+               "--child", mode, "--sessions", str(sessions), "--speed", str(speed)]
+    return subprocess.Popen(command, cwd=AGENT_DIR, stdout=subprocess.PIPE, text=True)
+
+
+def collect(child):
+    """The child's JSON report is its last stdout line; the agent logs to stdout too."""
+    return json.loads(child.communicate()[0].strip().splitlines()[-1])
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def summarize(mode, results, sessions):
+    rss = sum(r["rss_bytes"] for r in results)
+    overheads = [o for r in results for o in r["overheads"]]
+    return {
+        "mode": mode,
+        "processes": len(results),
+        "sessions": sessions,
+        "total_rss_mb": round(rss / 2**20, 1),
+        "rss_per_interview_mb": round(rss / sessions / 2**20, 1),
+        "turn_overhead_p50_ms": round(percentile(overheads, 0.5) * 1000, 2),
+        "turn_overhead_p95_ms": round(percentile(overheads, 0.95) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare process-per-job and multiplexed sessions.")
+    parser.add_argument("recording")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--speed", type=float, default=4.0)
+    parser.add_argument("--child", choices=("process", "multiplexed"))
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.recording, args.sessions, args.speed)
+        return
+
+    children = [spawn("process", args.recording, 1, args.speed) for _ in range(args.sessions)]
+    process_results = [collect(child) for child in children]
+
+    child = spawn("multiplexed", args.recording, args.sessions, args.speed)
+    multiplexed_results = [collect(child)]
+
+    print(json.dumps([
+        summarize("process", process_results, args.sessions),
+        summarize("multiplexed", multiplexed_results, args.sessions),
+    ], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Benchmark: size and serialization cost of the end-of-interview upload.
+#
+# Builds a synthetic 25-minute "deep" interview (transcript, live scores,
+# per-answer speech analytics and session metrics) and compares the original
+# v1 payload (a JSON list of turn dicts, uncompressed) with the v2 result
+# envelope at several gzip levels. zstd is reported when the `zstandard`
+# package is installed, for reference only: the backend's body parser
+# accepts gzip and deflate.
+#
+# Usage: python benchmarks/bench_result_envelope.py [--minutes 25] [--runs 50]
+
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from results import SessionClock, build_envelope, encode_envelope, new_idempotency_key  # noqa: E402
+
+WORDS = (
+    "the a we our service database cache latency request queue index query model training data "
+    "pipeline deploy kubernetes container api endpoint retry timeout consistency partition replica "
+    "because so then basically when which that this approach tradeoff scale users traffic memory "
+    "thread async event loop batch stream feature metric monitor alert rollback test coverage"
+).split()
+
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthetic_session(minutes, seed=0):
+    """Interviewer/candidate turns with monotonic timestamps, as app.py collects them."""
+    rng = random.Random(seed)
+    clock = SessionClock()
+    t = clock.started_monotonic + 2.0
+    transcript = []
+    end = clock.started_monotonic + minutes * 60
+    while t < end:
+        transcript.append({"role": "interviewer", "text": sentence(rng, rng.randint(18, 45)), "timestamp": t})
+        t += rng.uniform(6, 14)
+        words = rng.randint(40, 220)
+        transcript.append({
+            "role": "candidate",
+            "text": sentence(rng, words),
+            "timestamp": t,
+            "speechAnalytics": {
+                "audioSeconds": round(words / 2.3, 2),
+                "voicedSeconds": round(words / 2.9, 2),
+                "speakingSeconds": round(words / 2.4, 2),
+                "wordsPerMinute": rng.randint(110, 170),
+                "articulationRate": rng.randint(140, 200),
+                "pauses": rng.randint(0, 12),
+                "longPauses": rng.randint(0, 2),
+                "pauseSeconds": round(rng.uniform(0, 12), 2),
+                "meanPauseSeconds": round(rng.uniform(0.3, 1.5), 2),
+                "pauseHistogram": [rng.randint(0, 5) for _ in range(6)],
+                "energyMeanDb": round(rng.uniform(-30, -15), 1),
+                "energyStdDb": round(rng.uniform(2, 6), 1),
+            },
+        })
+        t += words / 2.3 + rng.uniform(1, 3)
+    clock.finish()
+
+    questions = sum(1 for entry in transcript if entry["role"] == "interviewer")
+    scores = [{
+        "questionNumber": n,
+        "score": rng.randint(40, 95),
+        "technicalAccuracy": rng.randint(40, 95),
+        "communicationClarity": rng.randint(40, 95),
+        "problemSolving": rng.randint(40, 95),
+        "depthOfKnowledge": rng.randint(40, 95),
+        "practicalExperience": rng.randint(40, 95),
+        "feedback": sentence(rng, 30),
+        "improvementTip": sentence(rng, 15),
+        "estimatedLevel": "intermediate",
+        "followUpQuestion": sentence(rng, 12),
+    } for n in range(1, questions + 1)]
+    metrics = {
+        "usage": {"llmRequests": questions * 2, "llmPromptTokens": 380_000, "llmCompletionTokens": 21_000,
+                  "sttAudioSeconds": minutes * 60.0, "ttsRequests": questions, "ttsCharacters": 9_800,
+                  "ttsAudioSeconds": 640.0, "estimatedCostUsd": 0.61},
+        "loopHealth": {"stalls": 1, "blockedSeconds": 0.12, "maxStallSeconds": 0.12, "sessionSeconds": minutes * 60.0},
+        "scoring": {"batches": questions // 3, "llm_seconds": 41.2, "readyAfterSeconds": 1.4},
+        "timeToFirstAudioSeconds": 1.9,
+    }
+    return clock, transcript, scores, metrics
+
+
+def legacy_payload(transcript, scores, metrics):
+    """The v1 body: turn dicts with float loop timestamps, posted via aiohttp json=."""
+    return {
+        "transcript": transcript,
+        "interviewType": "fullstack",
+        "difficultyLevel": "advanced",
+        "scores": scores,
+        "usage": metrics["usage"],
+        "loopHealth": metrics["loopHealth"],
+        "contentVersion": "0123456789ab",
+        "scoring": metrics["scoring"],
+    }
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, round(statistics.median(samples) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Result upload size and serialization benchmark.")
+    parser.add_argument("--minutes", type=float, default=25)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    clock, transcript, scores, metrics = synthetic_session(args.minutes)
+    legacy = legacy_payload(transcript, scores, metrics)
+    key = new_idempotency_key("bench")
+
+    def build():
+        return build_envelope(key, clock, transcript, "bench", "fullstack", "advanced",
+                              content_version="0123456789ab", scores=scores, metrics=metrics)
+
+    envelope, build_ms = timed(build, args.runs)
+    rows = []
+
+    body, ms = timed(lambda: json.dumps(legacy).encode("utf-8"), args.runs)
+    rows.append({"format": "v1 json", "bytes": len(body), "serialize_ms": ms})
+    body, ms = timed(lambda: gzip.compress(json.dumps(legacy).encode("utf-8"), 6), args.runs)
+    rows.append({"format": "v1 json + gzip-6", "bytes": len(body), "serialize_ms": ms})
+
+    body, ms = timed(lambda: json.dumps(envelope, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), args.runs)
+    rows.append({"format": "v2 envelope json", "bytes": len(body), "serialize_ms": ms})
+    for level in (1, 6, 9):
+        (body, _), ms = timed(lambda: encode_envelope(envelope, level), args.runs)
+        rows.append({"format": f"v2 envelope + gzip-{level}", "bytes": len(body), "serialize_ms": ms})
+
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        raw = json.dumps(envelope, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        body, ms = timed(lambda: compressor.compress(raw), args.runs)
+        rows.append({"format": "v2 envelope + zstd-3 (compress only)", "bytes": len(body), "serialize_ms": ms})
+
+    baseline = rows[0]["bytes"]
+    for row in rows:
+        row["ratio_vs_v1"] = round(row["bytes"] / baseline, 3)
+
+    print(json.dumps({
+        "minutes": args.minutes,
+        "turns": len(transcript),
+        "build_envelope_ms": build_ms,
+        "formats": rows,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Benchmark: speech analytics throughput.
+#
+# 1. Event-loop side: cost of push_frame per 20 ms frame, and bytes allocated
+#    per frame (should be ~0; samples are copied into preallocated blocks).
+# 2. Analysis side: 20 ms frames analysed per second of CPU time on one core,
+#    i.e. how many concurrent candidates one core could keep up with.
+#
+# Usage: python benchmarks/bench_speech_analytics.py [--seconds 600]
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from speech_analytics import SpeechAnalytics, SAMPLE_RATE, FRAME_MS  # noqa: E402
+
+
+def synthetic_answer(seconds, seed=0):
+    """Speech-like noise bursts separated by short and long silences, as int16 frames."""
+    rng = np.random.default_rng(seed)
+    frame_samples = SAMPLE_RATE * FRAME_MS // 1000
+    frames = int(seconds * 1000 / FRAME_MS)
+    loud = np.zeros(frames, dtype=bool)
+    position = 0
+    while position < frames:
+        talk = int(rng.uniform(0.3, 3.0) * 1000 / FRAME_MS)
+        loud[position:position + talk] = True
+        position += talk + int(rng.exponential(0.6) * 1000 / FRAME_MS)
+    amplitude = np.where(loud, 3000.0, 30.0)[:, None]
+    audio = rng.standard_normal((frames, frame_samples)) * amplitude
+    return [frame.tobytes() for frame in audio.astype(np.int16)]
+
+
+def bench_push(frames):
+    analytics = SpeechAnalytics(block_count=len(frames) // 25 + 2)
+    started = time.perf_counter()
+    for frame in frames:
+        analytics.push_frame(frame)
+    elapsed = time.perf_counter() - started
+    analytics.end_answer(0).result()
+    analytics.close()
+
+    # One block big enough for every frame, so only push_frame itself is traced
+    sample = frames[:5000]
+    analytics = SpeechAnalytics(block_ms=len(sample) * FRAME_MS + FRAME_MS, block_count=1)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for frame in sample:
+        analytics.push_frame(frame)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    analytics.close()
+
+    return {
+        "push_frame_us": round(elapsed / len(frames) * 1e6, 3),
+        "push_frame_bytes_retained": max(0, current - before),
+        "push_frame_peak_transient_bytes": max(0, peak - before),
+    }
+
+
+def bench_analysis(frames):
+    analytics = SpeechAnalytics()
+    blocks = np.frombuffer(b"".join(frames), dtype=np.int16)
+    block_samples = analytics.block_samples
+    block_count = len(blocks) // block_samples
+    frames_per_block = block_samples // analytics.frame_samples
+
+    # Drive the analysis directly on this thread to time one core
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    for i in range(block_count):
+        analytics._blocks[0][:] = blocks[i * block_samples:(i + 1) * block_samples]
+        analytics._free.clear()
+        analytics._process_block(0, block_samples)
+    stats = analytics._finish_answer(word_count=len(frames) // 20, word_timings=None)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    analytics.close()
+
+    analysed = block_count * frames_per_block
+    realtime_frames_per_second = 1000 / FRAME_MS
+    return {
+        "frames_analysed": analysed,
+        "frames_per_cpu_second": round(analysed / cpu),
+        "frames_per_wall_second": round(analysed / wall),
+        "realtime_streams_per_core": round(analysed / cpu / realtime_frames_per_second),
+        "pauses_found": stats["pauses"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech analytics throughput benchmark.")
+    parser.add_argument("--seconds", type=float, default=600, help="seconds of synthetic audio")
+    args = parser.parse_args()
+
+    frames = synthetic_answer(args.seconds)
+    print(json.dumps({"audio_seconds": args.seconds, **bench_push(frames), **bench_analysis(frames)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# IntervuAI interview content
+# Question banks and interviewer personas live in CONTENT_DIR as JSON. They are
+# validated and compiled into immutable, versioned snapshots. A reload swaps
+# the current snapshot atomically: new sessions pick up the new version while
+# running sessions keep the snapshot they started with.
+
+import os
+import json
+import time
+import hashlib
+import threading
+from types import MappingProxyType
+from observability import METRICS, process_rss_bytes
+
+CONTENT_DIR = os.environ.get("CONTENT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "content"))
+CONTENT_FILES = {
+    "question_banks": "question_banks.json",
+    "personas": "personas.json",
+}
+
+DIFFICULTY_LEVELS = ("beginner", "intermediate", "advanced")
+PERSONA_FIELDS = ("persona", "focus", "eval_style", "red_flags")
+DEFAULT_TYPE = "fullstack"
+
+# Interview type names used by the frontend that map to question bank keys
+INTERVIEW_TYPE_ALIASES = {
+    "data-science": "data_scientist",
+    "data_science": "data_scientist",
+    "ai-ml-engineer": "ai_ml_engineer",
+    "gen-ai-engineer": "gen_ai_engineer",
+    "mlops-engineer": "mlops_engineer",
+    "data-engineer": "data_engineer",
+}
+
+
+class ContentError(ValueError):
+    pass
+
+
+def validate_content(question_banks, personas):
+    """Raise ContentError if the raw content cannot be used by the agent."""
+    if not isinstance(question_banks, dict) or DEFAULT_TYPE not in question_banks:
+        raise ContentError(f"question banks must include '{DEFAULT_TYPE}'")
+    for interview_type, bank in question_banks.items():
+        for level in DIFFICULTY_LEVELS:
+            questions = bank.get(level) if isinstance(bank, dict) else None
+            if not questions or not all(isinstance(q, str) and q.strip() for q in questions):
+                raise ContentError(f"{interview_type}.{level} must be a non-empty list of questions")
+
+    if not isinstance(personas, dict) or DEFAULT_TYPE not in personas:
+        raise ContentError(f"personas must include '{DEFAULT_TYPE}'")
+    for interview_type, persona in personas.items():
+        for field in PERSONA_FIELDS:
+            value = persona.get(field) if isinstance(persona, dict) else None
+            if not isinstance(value, str) or not value.strip():
+                raise ContentError(f"persona {interview_type}.{field} must be a non-empty string")
+
+
+class ContentSnapshot:
+    """Immutable question banks and personas for one content version.
+
+    Derived prompt text is cached on the snapshot, so caches are naturally
+    invalidated when a new version is loaded.
+    """
+
+    def __init__(self, version, question_banks, personas):
+        self.version = version
+        self.question_banks = MappingProxyType({
+            interview_type: MappingProxyType({level: tuple(questions) for level, questions in bank.items()})
+            for interview_type, bank in question_banks.items()
+        })
+        self.personas = MappingProxyType({
+            interview_type: MappingProxyType(dict(persona))
+            for interview_type, persona in personas.items()
+        })
+        self._question_text = {}
+
+    def bank(self, interview_type):
+        normalized = INTERVIEW_TYPE_ALIASES.get(interview_type, interview_type)
+        return self.question_banks.get(normalized, self.question_banks[DEFAULT_TYPE])
+
+    def persona(self, interview_type):
+        return self.personas.get(interview_type, self.personas[DEFAULT_TYPE])
+
+    def questions_for_interview(self, interview_type, difficulty_level):
+        """Get the question bank for the given type and level."""
+        bank = self.bank(interview_type)
+        return list(bank.get(difficulty_level, bank["intermediate"]))
+
+    def progressive_questions(self, interview_type, difficulty_level):
+        """Start with fundamentals, then gradually increase depth."""
+        bank = self.bank(interview_type)
+        if difficulty_level == "beginner":
+            return list(bank["beginner"])
+        if difficulty_level == "intermediate":
+            return list(bank["beginner"][:3] + bank["intermediate"][:6])
+        if difficulty_level == "advanced":
+            return list(bank["beginner"][:2] + bank["intermediate"][:3] + bank["advanced"][:6])
+        return list(bank["intermediate"])
+
+    def question_bank_text(self, interview_type, difficulty_level):
+        """Question bank for the prompt, serialized once per type/level."""
+        key = (interview_type, difficulty_level)
+        text = self._question_text.get(key)
+        if text is None:
+            text = self._question_text[key] = json.dumps(
+                self.progressive_questions(interview_type, difficulty_level), indent=2
+            )
+        return text
+
+
+def _file_stamps(content_dir):
+    return tuple(
+        os.stat(os.path.join(content_dir, name)).st_mtime_ns
+        for name in CONTENT_FILES.values()
+    )
+
+
+def load_snapshot(content_dir=CONTENT_DIR):
+    """Read, validate and compile the content directory into a snapshot."""
+    raw = {}
+    digest = hashlib.sha256()
+    for key, name in CONTENT_FILES.items():
+        with open(os.path.join(content_dir, name), "rb") as f:
+            data = f.read()
+        digest.update(data)
+        try:
+            raw[key] = json.loads(data)
+        except ValueError as e:
+            raise ContentError(f"{name}: {e}") from e
+    validate_content(raw["question_banks"], raw["personas"])
+    return ContentSnapshot(digest.hexdigest()[:12], raw["question_banks"], raw["personas"])
+
+
+_state = {"snapshot": None, "stamps": None, "reloads": 0}
+_reload_lock = threading.Lock()
+
+
+def refresh_content(content_dir=CONTENT_DIR):
+    """Reload content if its files changed. Returns the current snapshot.
+
+    Does blocking file I/O; call it from a thread when on the event loop. An
+    invalid update is logged and the previous snapshot stays current.
+    """
+    with _reload_lock:
+        try:
+            stamps = _file_stamps(content_dir)
+        except OSError as e:
+            if _state["snapshot"] is None:
+                raise
+            print(f"Content directory unreadable, keeping v{_state['snapshot'].version}: {e}", flush=True)
+            return _state["snapshot"]
+        if stamps == _state["stamps"]:
+            return _state["snapshot"]
+
+        previous = _state["snapshot"]
+        rss_before = process_rss_bytes()
+        started = time.perf_counter()
+        try:
+            snapshot = load_snapshot(content_dir)
+        except (OSError, ContentError) as e:
+            METRICS.inc("content_reload_failures")
+            if previous is None:
+                raise
+            print(f"Rejected content update, keeping v{previous.version}: {e}", flush=True)
+            _state["stamps"] = stamps
+            return previous
+        elapsed = time.perf_counter() - started
+
+        _state["stamps"] = stamps
+        if previous is None or snapshot.version != previous.version:
+            _state["snapshot"] = snapshot
+            _state["reloads"] += 1
+            METRICS.inc("content_reloads")
+            METRICS.observe("content_reload", elapsed)
+            print(
+                f"Loaded content v{snapshot.version} in {elapsed * 1000:.1f} ms "
+                f"(RSS {(process_rss_bytes() - rss_before) / 1024:+.0f} KB)",
+                flush=True,
+            )
+        return _state["snapshot"]
+
+
+def get_content():
+    """Current content snapshot; loads it on first use."""
+    snapshot = _state["snapshot"]
+    return snapshot if snapshot is not None else refresh_content()
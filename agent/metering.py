@@ -0,0 +1,112 @@
+# IntervuAI usage metering
+# Counts LLM tokens, STT audio seconds and TTS characters per session, and
+# estimates their cost with the rates used in MARKET_COSTING_REPORT.md.
+# Finished sessions are added to the process's METRICS counters, which the
+# main worker merges across job processes for /metrics.
+
+import os
+from observability import METRICS
+
+# USD rates: Cerebras gpt-oss-120b, Deepgram Nova STT (PAYG), Deepgram Aura TTS (PAYG)
+PRICING = {
+    "llm_prompt_per_million": 0.35,
+    "llm_completion_per_million": 0.75,
+    "stt_per_minute": 0.0058,
+    "tts_per_thousand_chars": 0.030,
+}
+
+# Fraction of any budget at which the interview starts wrapping up
+BUDGET_WARN_FRACTION = float(os.environ.get("BUDGET_WARN_FRACTION", "0.8"))
+# Multiplier applied to every DURATION_CONFIG budget
+SESSION_BUDGET_SCALE = float(os.environ.get("SESSION_BUDGET_SCALE", "1.0"))
+
+BUDGET_OK = "ok"
+BUDGET_TIGHT = "tight"
+BUDGET_EXHAUSTED = "exhausted"
+
+
+class UsageMeter:
+    """Running usage totals for one session."""
+
+    def __init__(self):
+        self.llm_requests = 0
+        self.llm_prompt_tokens = 0
+        self.llm_completion_tokens = 0
+        self.stt_audio_seconds = 0.0
+        self.tts_requests = 0
+        self.tts_characters = 0
+        self.tts_audio_seconds = 0.0
+
+    def add_metrics(self, metrics):
+        """Add one LiveKit metrics event (LLM, STT or TTS; others are ignored)."""
+        metrics_type = getattr(metrics, "type", "")
+        if metrics_type == "llm_metrics":
+            self.add_llm_usage(metrics.prompt_tokens, metrics.completion_tokens)
+        elif metrics_type == "stt_metrics":
+            self.stt_audio_seconds += metrics.audio_duration or 0.0
+        elif metrics_type == "tts_metrics":
+            self.tts_requests += 1
+            self.tts_characters += metrics.characters_count or 0
+            self.tts_audio_seconds += metrics.audio_duration or 0.0
+
+    def add_llm_usage(self, prompt_tokens, completion_tokens):
+        self.llm_requests += 1
+        self.llm_prompt_tokens += prompt_tokens or 0
+        self.llm_completion_tokens += completion_tokens or 0
+
+    @property
+    def llm_tokens(self):
+        return self.llm_prompt_tokens + self.llm_completion_tokens
+
+    def cost_usd(self):
+        return (
+            self.llm_prompt_tokens / 1_000_000 * PRICING["llm_prompt_per_million"]
+            + self.llm_completion_tokens / 1_000_000 * PRICING["llm_completion_per_million"]
+            + self.stt_audio_seconds / 60 * PRICING["stt_per_minute"]
+            + self.tts_characters / 1000 * PRICING["tts_per_thousand_chars"]
+        )
+
+    def budget_fraction(self, budget):
+        """Return the largest used/limit ratio across the budgeted meters."""
+        used = {
+            "llm_tokens": self.llm_tokens,
+            "stt_seconds": self.stt_audio_seconds,
+            "tts_characters": self.tts_characters,
+        }
+        fractions = [
+            used[name] / (limit * SESSION_BUDGET_SCALE)
+            for name, limit in budget.items()
+            if name in used and limit
+        ]
+        return max(fractions, default=0.0)
+
+    def budget_level(self, budget):
+        fraction = self.budget_fraction(budget)
+        if fraction >= 1.0:
+            return BUDGET_EXHAUSTED
+        if fraction >= BUDGET_WARN_FRACTION:
+            return BUDGET_TIGHT
+        return BUDGET_OK
+
+    def summary(self):
+        return {
+            "llmRequests": self.llm_requests,
+            "llmPromptTokens": self.llm_prompt_tokens,
+            "llmCompletionTokens": self.llm_completion_tokens,
+            "sttAudioSeconds": round(self.stt_audio_seconds, 2),
+            "ttsRequests": self.tts_requests,
+            "ttsCharacters": self.tts_characters,
+            "ttsAudioSeconds": round(self.tts_audio_seconds, 2),
+            "estimatedCostUsd": round(self.cost_usd(), 5),
+        }
+
+
+def record_session_usage(meter):
+    """Add a finished session's usage to this process's metrics counters."""
+    METRICS.inc("usage_llm_requests", meter.llm_requests)
+    METRICS.inc("usage_llm_prompt_tokens", meter.llm_prompt_tokens)
+    METRICS.inc("usage_llm_completion_tokens", meter.llm_completion_tokens)
+    METRICS.inc("usage_stt_seconds", meter.stt_audio_seconds)
+    METRICS.inc("usage_tts_characters", meter.tts_characters)
+    METRICS.inc("usage_tts_seconds", meter.tts_audio_seconds)
+    METRICS.inc("usage_estimated_cost_usd", meter.cost_usd())
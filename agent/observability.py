@@ -0,0 +1,445 @@
+# IntervuAI worker observability
+# Each job process keeps its own counters, gauges and latency histograms and
+# periodically writes them to a small snapshot file. The main worker process
+# serves /metrics (Prometheus text format), /healthz and /readyz from a daemon
+# thread, merging the snapshots at scrape time, so scraping never touches the
+# event loops that carry audio.
+
+import os
+import json
+import time
+import asyncio
+import bisect
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9100"))
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), "intervuai-metrics"))
+SNAPSHOT_INTERVAL = float(os.environ.get("METRICS_SNAPSHOT_INTERVAL", "2"))
+# 0 means no limit; otherwise new jobs are rejected at this many unfinished jobs
+MAX_CONCURRENT_SESSIONS = int(os.environ.get("MAX_CONCURRENT_SESSIONS", "0"))
+# /healthz fails when the worker loop has not checked its load for this long
+WORKER_LIVENESS_TIMEOUT = float(os.environ.get("WORKER_LIVENESS_TIMEOUT", "30"))
+# How long an accepted job may take to appear among the worker's running jobs
+ADMISSION_GRACE_SECONDS = 30
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+FIRST_AUDIO_BUCKETS = (0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 15.0)
+
+# Provider latency histograms: name -> (LiveKit metrics type, attribute)
+PROVIDER_LATENCIES = {
+    "llm_ttft": ("llm_metrics", "ttft"),
+    "llm_duration": ("llm_metrics", "duration"),
+    "stt_duration": ("stt_metrics", "duration"),
+    "tts_ttfb": ("tts_metrics", "ttfb"),
+    "eou_delay": ("eou_metrics", "end_of_utterance_delay"),
+}
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts[i] holds observations <= buckets[i]."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        return {"buckets": self.buckets, "counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+    def merge_dict(self, data):
+        if tuple(data["buckets"]) != self.buckets:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, data["counts"])]
+        self.sum += data["sum"]
+        self.count += data["count"]
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms for one process."""
+
+    def __init__(self):
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.loop_lag_max = 0.0
+        # Sessions on different threads share a registry in multiplexed mode
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = self.gauges.get(name, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(buckets)
+            histogram.observe(value)
+
+    def observe_provider_metrics(self, metrics):
+        """Record latencies from one LiveKit metrics event."""
+        metrics_type = getattr(metrics, "type", "")
+        for name, (source_type, attribute) in PROVIDER_LATENCIES.items():
+            if source_type == metrics_type:
+                value = getattr(metrics, attribute, None)
+                if value is not None and value >= 0:
+                    self.observe(name, value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "updated": time.time(),
+                "rss_bytes": process_rss_bytes(),
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+                "loop_lag_max": self.loop_lag_max,
+            }
+
+
+# Registry for the current process (main worker or job process)
+METRICS = MetricsRegistry()
+
+_page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss_bytes():
+    """Resident set size of this process, or 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _page_size
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+# ---------------------------------------------------------------------------
+# Job process side
+# ---------------------------------------------------------------------------
+
+_job_tasks = {"loop": None, "tasks": []}
+
+
+def start_job_metrics():
+    """Start the snapshot writer for this job process (one per process, even
+    when several sessions run on their own loops in multiplexed mode).
+
+    Loop lag is sampled by the watchdog heartbeat (see watchdog.py).
+    """
+    current = _job_tasks["loop"]
+    if current is not None and not current.is_closed():
+        return
+    loop = asyncio.get_running_loop()
+    _job_tasks["loop"] = loop
+    _job_tasks["tasks"] = [asyncio.create_task(_write_snapshots(SNAPSHOT_INTERVAL))]
+
+
+def snapshot_path(pid=None):
+    return os.path.join(METRICS_DIR, f"{pid or os.getpid()}.json")
+
+
+def write_snapshot(snapshot):
+    """Atomically write a snapshot file (runs in a worker thread)."""
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = snapshot_path(snapshot["pid"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+async def flush_job_metrics():
+    """Write this process's snapshot now (e.g. when a session ends)."""
+    try:
+        await asyncio.to_thread(write_snapshot, METRICS.snapshot())
+    except OSError as e:
+        print(f"Failed to write metrics snapshot: {e}", flush=True)
+
+
+async def _write_snapshots(interval):
+    while True:
+        await asyncio.sleep(interval)
+        await flush_job_metrics()
+
+
+# ---------------------------------------------------------------------------
+# Main worker side
+# ---------------------------------------------------------------------------
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Counters and histograms of exited job processes, so totals never go backwards
+RETIRED = MetricsRegistry()
+_collect_lock = threading.Lock()
+
+
+def _merge_into(target, snapshot, include_gauges=True):
+    for name, value in snapshot["counters"].items():
+        target.inc(name, value)
+    if include_gauges:
+        for name, value in snapshot["gauges"].items():
+            target.add_gauge(name, value)
+    for name, data in snapshot["histograms"].items():
+        if name not in target.histograms:
+            target.histograms[name] = Histogram(data["buckets"])
+        target.histograms[name].merge_dict(data)
+    target.loop_lag_max = max(target.loop_lag_max, snapshot["loop_lag_max"])
+
+
+def collect_snapshots():
+    """Read live job-process snapshots, retiring files left by exited processes."""
+    snapshots = []
+    with _collect_lock:
+        try:
+            names = os.listdir(METRICS_DIR)
+        except FileNotFoundError:
+            return snapshots
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(METRICS_DIR, name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pid = snapshot.get("pid", 0)
+            if pid == os.getpid():
+                continue
+            if not _pid_alive(pid):
+                _merge_into(RETIRED, snapshot, include_gauges=False)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def aggregate(snapshots):
+    """Merge job snapshots with the main process and retired registries."""
+    total = MetricsRegistry()
+    for source in [METRICS.snapshot(), RETIRED.snapshot()] + snapshots:
+        _merge_into(total, source)
+    return total
+
+
+def _format_histogram(lines, metric, label, histogram):
+    prefix = f"{label}," if label else ""
+    suffix = f"{{{label}}}" if label else ""
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    lines.append(f"{metric}_sum{suffix} {histogram.sum:.6f}")
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+
+
+def render_prometheus(snapshots=None):
+    """Render the merged metrics in Prometheus text exposition format."""
+    if snapshots is None:
+        snapshots = collect_snapshots()
+    total = aggregate(snapshots)
+    counters, gauges = total.counters, total.gauges
+
+    lines = [
+        "# TYPE intervuai_jobs_accepted_total counter",
+        f"intervuai_jobs_accepted_total {counters.get('jobs_accepted', 0)}",
+        "# TYPE intervuai_jobs_rejected_total counter",
+        f"intervuai_jobs_rejected_total {counters.get('jobs_rejected', 0)}",
+        "# TYPE intervuai_sessions_completed_total counter",
+        f"intervuai_sessions_completed_total {counters.get('sessions_completed', 0)}",
+        "# TYPE intervuai_sessions_failed_total counter",
+        f"intervuai_sessions_failed_total {counters.get('sessions_failed', 0)}",
+        "# TYPE intervuai_active_sessions gauge",
+        f"intervuai_active_sessions {gauges.get('active_sessions', 0)}",
+        "# TYPE intervuai_pending_uploads gauge",
+        f"intervuai_pending_uploads {gauges.get('pending_uploads', 0)}",
+        "# TYPE intervuai_job_processes gauge",
+        f"intervuai_job_processes {len(snapshots)}",
+        "# TYPE intervuai_event_loop_lag_max_seconds gauge",
+        f"intervuai_event_loop_lag_max_seconds {total.loop_lag_max:.6f}",
+        # Job processes are short-lived, so their RSS is aggregated rather than labelled by pid
+        "# TYPE intervuai_process_rss_bytes gauge",
+        f'intervuai_process_rss_bytes{{process="worker"}} {process_rss_bytes()}',
+        f'intervuai_process_rss_bytes{{process="jobs"}} {sum(s["rss_bytes"] for s in snapshots)}',
+        "# TYPE intervuai_job_process_rss_max_bytes gauge",
+        f"intervuai_job_process_rss_max_bytes {max((s['rss_bytes'] for s in snapshots), default=0)}",
+    ]
+
+    lines += [
+        "# TYPE intervuai_llm_requests_total counter",
+        f"intervuai_llm_requests_total {counters.get('usage_llm_requests', 0)}",
+        "# TYPE intervuai_llm_tokens_total counter",
+        f'intervuai_llm_tokens_total{{kind="prompt"}} {counters.get("usage_llm_prompt_tokens", 0)}',
+        f'intervuai_llm_tokens_total{{kind="completion"}} {counters.get("usage_llm_completion_tokens", 0)}',
+        "# TYPE intervuai_stt_seconds_total counter",
+        f"intervuai_stt_seconds_total {counters.get('usage_stt_seconds', 0):.3f}",
+        "# TYPE intervuai_tts_characters_total counter",
+        f"intervuai_tts_characters_total {counters.get('usage_tts_characters', 0)}",
+        "# TYPE intervuai_tts_seconds_total counter",
+        f"intervuai_tts_seconds_total {counters.get('usage_tts_seconds', 0):.3f}",
+        "# TYPE intervuai_estimated_cost_usd_total counter",
+        f"intervuai_estimated_cost_usd_total {counters.get('usage_estimated_cost_usd', 0):.6f}",
+    ]
+
+    lag = total.histograms.get("loop_lag")
+    if lag:
+        lines.append("# TYPE intervuai_event_loop_lag_seconds histogram")
+        _format_histogram(lines, "intervuai_event_loop_lag_seconds", "", lag)
+
+    lines.append("# TYPE intervuai_event_loop_stalls_total counter")
+    lines.append(f"intervuai_event_loop_stalls_total {counters.get('loop_stalls', 0)}")
+    stall = total.histograms.get("loop_stall")
+    if stall:
+        lines.append("# TYPE intervuai_event_loop_stall_seconds histogram")
+        _format_histogram(lines, "intervuai_event_loop_stall_seconds", "", stall)
+
+    provider_names = [name for name in PROVIDER_LATENCIES if name in total.histograms]
+    if provider_names:
+        lines.append("# TYPE intervuai_provider_latency_seconds histogram")
+        for name in provider_names:
+            _format_histogram(lines, "intervuai_provider_latency_seconds", f'stage="{name}"', total.histograms[name])
+
+    lines.append("# TYPE intervuai_content_reloads_total counter")
+    lines.append(f"intervuai_content_reloads_total {counters.get('content_reloads', 0)}")
+    lines.append("# TYPE intervuai_content_reload_failures_total counter")
+    lines.append(f"intervuai_content_reload_failures_total {counters.get('content_reload_failures', 0)}")
+    content_reload = total.histograms.get("content_reload")
+    if content_reload:
+        lines.append("# TYPE intervuai_content_reload_seconds histogram")
+        _format_histogram(lines, "intervuai_content_reload_seconds", "", content_reload)
+
+    first_audio = total.histograms.get("time_to_first_audio")
+    if first_audio:
+        lines.append("# TYPE intervuai_time_to_first_audio_seconds histogram")
+        _format_histogram(lines, "intervuai_time_to_first_audio_seconds", "", first_audio)
+
+    upload = total.histograms.get("upload")
+    if upload:
+        lines.append("# TYPE intervuai_upload_seconds histogram")
+        _format_histogram(lines, "intervuai_upload_seconds", "", upload)
+
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Main worker side: admission control and liveness
+# ---------------------------------------------------------------------------
+
+_worker_state = {"worker": None, "last_beat": None, "started": time.monotonic(), "admitted": {}}
+_worker_lock = threading.Lock()
+
+
+def note_worker_alive(worker):
+    """Record a liveness beat; called from the worker's periodic load check."""
+    with _worker_lock:
+        _worker_state["worker"] = worker
+        _worker_state["last_beat"] = time.monotonic()
+
+
+def admit_job(job_id):
+    """Count an accepted job until it shows up among the worker's running jobs."""
+    with _worker_lock:
+        _worker_state["admitted"][job_id] = time.monotonic()
+
+
+def admitted_jobs():
+    """Jobs this worker accepted that have not finished (no file I/O)."""
+    worker = _worker_state["worker"]
+    running = {info.job.id for info in worker.active_jobs} if worker is not None else set()
+    now = time.monotonic()
+    with _worker_lock:
+        admitted = _worker_state["admitted"]
+        for job_id, accepted_at in list(admitted.items()):
+            if job_id in running or now - accepted_at > ADMISSION_GRACE_SECONDS:
+                del admitted[job_id]
+        return len(running) + len(admitted)
+
+
+def is_alive():
+    last_beat = _worker_state["last_beat"] or _worker_state["started"]
+    return time.monotonic() - last_beat < WORKER_LIVENESS_TIMEOUT
+
+
+def is_ready():
+    if not is_alive():
+        return False
+    return MAX_CONCURRENT_SESSIONS <= 0 or admitted_jobs() < MAX_CONCURRENT_SESSIONS
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send(200, render_prometheus(), "text/plain; version=0.0.4")
+        elif self.path == "/healthz":
+            if is_alive():
+                self._send(200, "ok\n")
+            else:
+                self._send(503, "worker loop unresponsive\n")
+        elif self.path == "/readyz":
+            if is_ready():
+                self._send(200, "ready\n")
+            else:
+                self._send(503, "at capacity\n")
+        else:
+            self._send(404, "not found\n")
+
+    def _send(self, status, body, content_type="text/plain"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Serve /metrics, /healthz and /readyz from a daemon thread. Returns the server or None.
+
+    Must run in the process that runs the LiveKit worker (in dev mode that is
+    the file watcher's child, not the CLI process), since admission and
+    liveness state live there. Idempotent.
+    """
+    with _worker_lock:
+        if port <= 0 or "server" in _worker_state:
+            return _worker_state.get("server")
+        _worker_state["server"] = None
+        _worker_state["started"] = time.monotonic()
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    except OSError as e:
+        print(f"Failed to start metrics endpoint on :{port}: {e}", flush=True)
+        return None
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    _worker_state["server"] = server
+    print(f"Metrics endpoint listening on :{port}/metrics", flush=True)
+    return server
@@ -0,0 +1,98 @@
+# IntervuAI session recorder
+# Writes the event stream of one interview (metadata, committed speech and
+# provider metrics) as JSON lines so it can be replayed offline. Events are
+# queued from session callbacks and serialized and written by a background
+# thread, so no file or gzip I/O happens on the event loop.
+
+import os
+import json
+import gzip
+import time
+import queue
+import threading
+import zlib
+
+RECORDING_FORMAT_VERSION = 1
+
+
+def recording_path(record_dir, name):
+    """Build a unique recording file path for one session."""
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(name))
+    return os.path.join(record_dir, f"{safe_name}-{int(time.time())}.jsonl.gz")
+
+
+class SessionRecorder:
+    """Append-only JSONL recorder. Paths ending in .gz are gzip-compressed.
+
+    Every event carries `t`, the monotonic offset in seconds from the start of
+    the recording, which the replay engine uses to reproduce timings.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._started = time.monotonic()
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self.event_count = 0
+        self.record("header", version=RECORDING_FORMAT_VERSION, wall_clock=time.time())
+        self._writer = threading.Thread(target=self._write_events, name="session-recorder", daemon=True)
+        self._writer.start()
+
+    def record(self, event_type, **fields):
+        if self._closed:
+            return
+        self._queue.put({"t": round(time.monotonic() - self._started, 4), "type": event_type, **fields})
+        self.event_count += 1
+
+    def _write_events(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            opener = gzip.open if self.path.endswith(".gz") else open
+            with opener(self.path, "wt", encoding="utf-8") as f:
+                while True:
+                    event = self._queue.get()
+                    if event is None:
+                        return
+                    f.write(json.dumps(event, separators=(",", ":"), default=str) + "\n")
+        except OSError as e:
+            print(f"Session recording to {self.path} failed: {e}", flush=True)
+
+    def record_metrics(self, metrics):
+        """Record a LiveKit metrics object (LLM/STT/TTS/EOU) as a flat dict."""
+        if hasattr(metrics, "model_dump"):
+            data = metrics.model_dump(mode="json")
+        else:
+            data = dict(vars(metrics))
+        metrics_type = data.pop("type", type(metrics).__name__)
+        self.record("metrics", metrics_type=metrics_type, **data)
+
+    def close(self):
+        """Write the end marker and wait for the file to be finalized (blocking)."""
+        if self._closed:
+            return
+        self.record("end")
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+
+
+def load_recording(path):
+    """Read a recording back into a list of event dicts.
+
+    A recording cut short (e.g. the worker was killed) is read up to the last
+    complete event.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    events = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    events.append(json.loads(line))
+        except (EOFError, zlib.error, json.JSONDecodeError):
+            pass
+    if not events or events[0].get("type") != "header":
+        raise ValueError(f"{path} is not a session recording")
+    if events[0].get("version") != RECORDING_FORMAT_VERSION:
+        raise ValueError(f"Unsupported recording version {events[0].get('version')}")
+    return events
@@ -0,0 +1,191 @@
+# IntervuAI session replay
+# Re-drives InterviewerAgent offline from a recording made with
+# SESSION_RECORD_DIR, using stand-in providers that reproduce the recorded
+# LLM, STT and TTS timings. Prints a JSON timing report.
+#
+# Usage: python replay.py recordings/<session>.jsonl.gz [--speed 1.0]
+
+import sys
+import json
+import asyncio
+import argparse
+import time
+from collections import deque
+from livekit.agents import AgentSession, DEFAULT_API_CONNECT_OPTIONS, llm
+from recorder import load_recording
+from app import InterviewerAgent, get_agent_config
+
+
+def build_replay_script(events):
+    """Turn a recorded event stream into the greeting and the candidate turns.
+
+    Each interviewer response belongs to the candidate turn recorded just
+    before it (the greeting to none), so turns with several responses (an
+    interrupted reply, a budget-forced conclusion) keep the rest aligned.
+    Consecutive candidate utterances with no response between them are one
+    turn. Metrics recorded between two interviewer utterances are attributed
+    to the later one, since they were produced while generating and speaking it.
+    """
+    metadata = {}
+    greeting = []
+    user_turns = []
+    responses = greeting
+    pending = {"llm_ttft": None, "llm_seconds": 0.0, "tts_audio_seconds": 0.0}
+    pending_eou = 0.0
+
+    for event in events:
+        if event["type"] == "metadata":
+            metadata = event["metadata"]
+        elif event["type"] == "metrics":
+            kind = event.get("metrics_type", "")
+            if kind == "llm_metrics":
+                if pending["llm_ttft"] is None:
+                    pending["llm_ttft"] = event.get("ttft", 0.0)
+                pending["llm_seconds"] += event.get("duration", 0.0)
+            elif kind == "tts_metrics":
+                pending["tts_audio_seconds"] += event.get("audio_duration", 0.0)
+            elif kind == "eou_metrics":
+                pending_eou = event.get("end_of_utterance_delay", 0.0)
+        elif event["type"] == "speech" and event["role"] == "interviewer":
+            responses.append({
+                "text": event["text"],
+                "recorded_at": event["t"],
+                "llm_ttft": pending["llm_ttft"] or 0.0,
+                "llm_seconds": pending["llm_seconds"],
+                "tts_audio_seconds": pending["tts_audio_seconds"],
+            })
+            pending = {"llm_ttft": None, "llm_seconds": 0.0, "tts_audio_seconds": 0.0}
+        elif event["type"] == "speech" and event["role"] == "candidate":
+            if user_turns and not user_turns[-1]["responses"]:
+                # Still the same answer: nothing was said in between
+                turn = user_turns[-1]
+                turn["text"] += " " + event["text"]
+                turn["eou_delay"] = pending_eou
+            else:
+                turn = {
+                    "text": event["text"],
+                    "recorded_at": event["t"],
+                    "eou_delay": pending_eou,
+                    "responses": [],
+                }
+                user_turns.append(turn)
+            responses = turn["responses"]
+            pending_eou = 0.0
+
+    return {"metadata": metadata, "greeting": greeting, "user_turns": user_turns}
+
+
+class ReplayLLM(llm.LLM):
+    """Stand-in LLM that returns recorded interviewer replies with recorded latency.
+
+    Replies are served from the current turn's recorded responses; call
+    begin_turn() before driving each candidate turn.
+    """
+
+    def __init__(self, responses, speed=1.0):
+        super().__init__()
+        self.speed = speed
+        self.served = 0
+        self.request_count = 0
+        self._pending = deque(responses)
+
+    def begin_turn(self, responses):
+        self._pending = deque(responses)
+
+    def chat(self, *, chat_ctx, tools=None, conn_options=DEFAULT_API_CONNECT_OPTIONS, **kwargs):
+        self.request_count += 1
+        if self._pending:
+            response = self._pending.popleft()
+        else:
+            response = {"text": "Thank you, that concludes our interview.", "llm_ttft": 0.0, "llm_seconds": 0.0}
+        self.served += 1
+        return ReplayLLMStream(self, response, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class ReplayLLMStream(llm.LLMStream):
+    def __init__(self, replay_llm, response, *, chat_ctx, tools, conn_options):
+        super().__init__(replay_llm, chat_ctx=chat_ctx, tools=tools, conn_options=conn_options)
+        self._response = response
+        self._speed = replay_llm.speed
+
+    async def _run(self):
+        ttft = self._response["llm_ttft"] / self._speed
+        await asyncio.sleep(ttft)
+        self._event_ch.send_nowait(
+            llm.ChatChunk(
+                id=f"replay-{id(self)}",
+                delta=llm.ChoiceDelta(role="assistant", content=self._response["text"]),
+            )
+        )
+        await asyncio.sleep(max(0.0, self._response["llm_seconds"] / self._speed - ttft))
+
+
+async def replay(path, speed=1.0, vad=None):
+    script = build_replay_script(load_recording(path))
+    greeting = script["greeting"]
+    replay_llm = ReplayLLM(greeting, speed)
+    providers = {"llm": replay_llm, "stt": None, "tts": None, "vad": vad}
+
+    init_started = time.perf_counter()
+    agent = InterviewerAgent(**get_agent_config(script["metadata"]), providers=providers)
+    init_seconds = time.perf_counter() - init_started
+
+    turns = []
+    replay_started = time.perf_counter()
+    async with AgentSession() as session:
+        await session.start(agent)
+
+        # on_enter generates the greeting without user input
+        while replay_llm.served < 1:
+            await asyncio.sleep(0.01)
+        if greeting:
+            await asyncio.sleep(sum(r["llm_seconds"] + r["tts_audio_seconds"] for r in greeting) / speed)
+
+        for index, turn in enumerate(script["user_turns"]):
+            # Stand-in STT: the recorded end-of-utterance delay
+            await asyncio.sleep(turn["eou_delay"] / speed)
+            recorded = turn["responses"]
+            replay_llm.begin_turn(recorded)
+            started = time.perf_counter()
+            await session.run(user_input=turn["text"])
+            elapsed = time.perf_counter() - started
+            # The run waits for the direct reply; later responses to this turn
+            # were not prompted by the candidate
+            recorded_llm = recorded[0]["llm_seconds"] / speed if recorded else 0.0
+            turns.append({
+                "turn": index + 1,
+                "responses": len(recorded),
+                "replay_seconds": round(elapsed, 4),
+                "recorded_llm_seconds": round(recorded_llm, 4),
+                "overhead_seconds": round(elapsed - recorded_llm, 4),
+            })
+            # Stand-in TTS: wait out the recorded playback before the next answer
+            if recorded:
+                await asyncio.sleep(sum(r["tts_audio_seconds"] for r in recorded) / speed)
+
+    overheads = sorted(t["overhead_seconds"] for t in turns)
+    return {
+        "recording": path,
+        "speed": speed,
+        "agent_init_seconds": round(init_seconds, 4),
+        "replay_seconds": round(time.perf_counter() - replay_started, 4),
+        "llm_requests": replay_llm.request_count,
+        "turns": turns,
+        "overhead_p50_seconds": overheads[len(overheads) // 2] if overheads else 0.0,
+        "overhead_max_seconds": overheads[-1] if overheads else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded IntervuAI session offline.")
+    parser.add_argument("recording", help="path to a .jsonl or .jsonl.gz recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="divide recorded timings by this factor")
+    args = parser.parse_args()
+
+    report = asyncio.run(replay(args.recording, args.speed))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
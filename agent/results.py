@@ -0,0 +1,108 @@
+# IntervuAI result envelope
+# The end-of-interview upload is a versioned envelope. Turn timings are stored
+# as columns of millisecond offsets from a session start recorded on both the
+# wall clock and the monotonic clock, so the backend can place every turn in
+# real time. Scores, speech analytics and session metrics are optional
+# sections. The body is gzip-compressed and carries an idempotency key, so a
+# failed upload can be retried without the backend processing it twice.
+
+import os
+import gzip
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+SCHEMA_VERSION = 2
+GZIP_LEVEL = int(os.environ.get("RESULTS_GZIP_LEVEL", "6"))
+UPLOAD_ATTEMPTS = int(os.environ.get("RESULTS_UPLOAD_ATTEMPTS", "6"))
+UPLOAD_TIMEOUT = float(os.environ.get("RESULTS_UPLOAD_TIMEOUT", "120"))
+# Longest Retry-After the upload honours before its next attempt
+UPLOAD_MAX_RETRY_AFTER = 60
+
+# Per-answer speech statistics stored as columns in the analytics section
+ANALYTICS_FIELDS = (
+    "audioSeconds", "voicedSeconds", "speakingSeconds", "wordsPerMinute", "articulationRate",
+    "pauses", "longPauses", "pauseSeconds", "meanPauseSeconds", "pauseHistogram",
+    "energyMeanDb", "energyStdDb", "wordGapMeanSeconds", "wordGapsOverHalfSecond",
+)
+
+
+class SessionClock:
+    """Session start on the wall clock and the monotonic clock."""
+
+    def __init__(self):
+        self.started_wall = time.time()
+        self.started_monotonic = time.monotonic()
+        self.ended_monotonic = None
+
+    def finish(self):
+        self.ended_monotonic = time.monotonic()
+
+    def elapsed(self):
+        end = self.ended_monotonic if self.ended_monotonic is not None else time.monotonic()
+        return end - self.started_monotonic
+
+    def offset_ms(self, monotonic):
+        """Milliseconds from session start to a time.monotonic() reading."""
+        return round((monotonic - self.started_monotonic) * 1000)
+
+
+def new_idempotency_key(interview_id):
+    """One key per session; every retry of its upload reuses it."""
+    return f"{interview_id}:{uuid.uuid4().hex}"
+
+
+def build_envelope(idempotency_key, clock, transcript, interview_id, interview_type, difficulty_level,
+                   content_version=None, scores=None, metrics=None):
+    """Assemble the upload envelope from transcript entries.
+
+    Entries are dicts with role, text, a time.monotonic() timestamp and, for
+    candidate turns, optional speechAnalytics.
+    """
+    turns = {"role": [], "text": [], "offsetMs": []}
+    analytics = {"turn": [], **{field: [] for field in ANALYTICS_FIELDS}}
+    for index, entry in enumerate(transcript):
+        turns["role"].append(entry["role"])
+        turns["text"].append(entry["text"])
+        turns["offsetMs"].append(clock.offset_ms(entry["timestamp"]))
+        stats = entry.get("speechAnalytics")
+        if stats:
+            analytics["turn"].append(index)
+            for field in ANALYTICS_FIELDS:
+                analytics[field].append(stats.get(field))
+
+    envelope = {
+        "schemaVersion": SCHEMA_VERSION,
+        "idempotencyKey": idempotency_key,
+        "interviewId": interview_id,
+        "interviewType": interview_type,
+        "difficultyLevel": difficulty_level,
+        "contentVersion": content_version,
+        "session": {
+            "startedAt": datetime.fromtimestamp(clock.started_wall, timezone.utc).isoformat(timespec="milliseconds"),
+            "startedAtMs": round(clock.started_wall * 1000),
+            "durationMs": round(clock.elapsed() * 1000),
+        },
+        "turns": turns,
+    }
+    if scores:
+        envelope["scores"] = scores
+    if analytics["turn"]:
+        envelope["analytics"] = analytics
+    if metrics:
+        envelope["metrics"] = metrics
+    return envelope
+
+
+def encode_envelope(envelope, level=GZIP_LEVEL):
+    """Serialize and gzip an envelope. Returns (body, headers)."""
+    raw = json.dumps(envelope, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    body = gzip.compress(raw, compresslevel=level, mtime=0)
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Encoding": "gzip",
+        "Idempotency-Key": envelope["idempotencyKey"],
+        "X-Results-Schema": str(envelope["schemaVersion"]),
+    }
+    return body, headers
@@ -0,0 +1,283 @@
+# IntervuAI live scoring
+# Scores question/answer pairs in the background while the interview runs,
+# so the score sheet is ready the moment the candidate hangs up.
+
+import os
+import json
+import asyncio
+import aiohttp
+import time
+
+CEREBRAS_API_URL = "https://api.cerebras.ai/v1/chat/completions"
+SCORING_MODEL = os.environ.get("SCORING_MODEL", "gpt-oss-120b")
+SCORING_BATCH_SIZE = int(os.environ.get("SCORING_BATCH_SIZE", "3"))
+SCORING_BATCH_WINDOW = float(os.environ.get("SCORING_BATCH_WINDOW", "20"))
+SCORING_TIMEOUT = float(os.environ.get("SCORING_TIMEOUT", "30"))
+
+# Answers at or below this length are not scored (mirrors the backend rule)
+MIN_RESPONSE_LENGTH = 10
+
+# Feedback depth, extra fields and token budget per analysis tier, matching
+# gptService.evaluateResponse on the backend
+SCORING_TIERS = {
+    "basic": {
+        "feedback": "2-3 sentences of feedback",
+        "feedback_hint": "2-3 sentence feedback",
+        "follow_up": "one follow-up question that asks exactly one thing and probes the weakest dimension",
+        "extra_fields": (),
+        "max_tokens": 300,
+    },
+    "detailed": {
+        "feedback": "detailed feedback (3-4 sentences: strengths, weaknesses, and what to improve)",
+        "feedback_hint": "3-4 sentence detailed feedback",
+        "follow_up": "one follow-up question that asks exactly one thing and probes the most important technical gap",
+        "extra_fields": (),
+        "max_tokens": 450,
+    },
+    "premium": {
+        "feedback": "detailed feedback (5-7 sentences: what they did well, what was incorrect or missing, what an ideal answer would include)",
+        "feedback_hint": "detailed 5-7 sentence feedback",
+        "follow_up": "one follow-up question that asks exactly one thing and probes their weakest technical dimension",
+        "extra_fields": ("improvementTip", "estimatedLevel"),
+        "max_tokens": 600,
+    },
+}
+
+TIER_FIELD_TEMPLATES = {
+    "improvementTip": '"improvementTip": "<one specific actionable tip>"',
+    "estimatedLevel": '"estimatedLevel": "<junior|mid|senior>"',
+}
+
+SCORE_FIELDS = (
+    "score",
+    "technicalAccuracy",
+    "communicationClarity",
+    "problemSolving",
+    "depthOfKnowledge",
+    "practicalExperience",
+)
+
+
+def scoring_tier(analysis_type):
+    return SCORING_TIERS.get(analysis_type, SCORING_TIERS["basic"])
+
+
+def build_rubric(persona_data, interview_type, difficulty_level, analysis_type="basic"):
+    """Build the scoring rubric from the interviewer persona and analysis tier."""
+    tier = scoring_tier(analysis_type)
+    extras = ""
+    if tier["extra_fields"]:
+        extras = "\nAlso give a specific improvement tip they can act on immediately and their estimated experience level based on the answer (junior/mid/senior)."
+    return f"""You are {persona_data['persona']}, scoring answers from a {difficulty_level} level {interview_type.replace('_', ' ')} interview.
+
+WHAT YOU'RE LOOKING FOR:
+{persona_data['eval_style']}
+
+RED FLAGS (lower the score when present):
+{persona_data['red_flags']}
+
+Rate each answer on these dimensions (0-100): Technical Accuracy, Communication Clarity, Problem Solving, Depth of Knowledge, Practical Experience.
+Give an overall score (0-100), {tier['feedback']} and {tier['follow_up']}.{extras}"""
+
+
+def build_batch_prompt(pairs, analysis_type="basic"):
+    """Build the user message for a batch of question/answer pairs."""
+    tier = scoring_tier(analysis_type)
+    extra_lines = "".join(f",\n    {TIER_FIELD_TEMPLATES[field]}" for field in tier["extra_fields"])
+    items = "\n\n".join(
+        f"Question {p['questionNumber']}: \"{p['questionText']}\"\nCandidate's Response: \"{p['candidateResponse']}\""
+        for p in pairs
+    )
+    return f"""{items}
+
+IMPORTANT: Return ONLY a valid JSON array with one object per question, no markdown:
+[
+  {{
+    "questionNumber": <question number>,
+    "score": <0-100>,
+    "technicalAccuracy": <0-100>,
+    "communicationClarity": <0-100>,
+    "problemSolving": <0-100>,
+    "depthOfKnowledge": <0-100>,
+    "practicalExperience": <0-100>,
+    "feedback": "<{tier['feedback_hint']}>",
+    "followUpQuestion": "<follow-up question>"{extra_lines}
+  }}
+]"""
+
+
+def parse_batch_response(content):
+    """Parse the model output into a dict of evaluations keyed by question number."""
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end == -1:
+        raise ValueError("No JSON array in scoring response")
+
+    results = {}
+    for item in json.loads(text[start:end + 1]):
+        if not isinstance(item, dict) or "questionNumber" not in item:
+            continue
+        evaluation = {
+            field: max(0, min(100, int(item.get(field, item.get("score", 0)) or 0)))
+            for field in SCORE_FIELDS
+        }
+        evaluation["feedback"] = str(item.get("feedback", ""))
+        evaluation["followUpQuestion"] = str(item.get("followUpQuestion", ""))
+        for field in TIER_FIELD_TEMPLATES:
+            if item.get(field):
+                evaluation[field] = str(item[field])
+        results[int(item["questionNumber"])] = evaluation
+    return results
+
+
+class LiveScorer:
+    """Pairs transcript entries into Q&A turns and scores them in batches.
+
+    Pairs are submitted when the interviewer starts the next question, which is
+    when the conversation LLM is idle waiting for the candidate. At most one
+    scoring request is in flight, so scoring never competes with the live turn.
+    """
+
+    def __init__(self, persona_data, interview_type, difficulty_level,
+                 analysis_type="basic", api_key=None, batch_size=SCORING_BATCH_SIZE,
+                 batch_window=SCORING_BATCH_WINDOW, post_fn=None, on_usage=None):
+        self.analysis_type = analysis_type if analysis_type in SCORING_TIERS else "basic"
+        self.rubric = build_rubric(persona_data, interview_type, difficulty_level, self.analysis_type)
+        self.api_key = api_key if api_key is not None else os.environ.get("CEREBRAS_API_KEY", "")
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.post_fn = post_fn or self._post_cerebras
+        self.on_usage = on_usage
+        self.scores = {}
+        self.stats = {"batches": 0, "pairs": 0, "failures": 0, "llm_seconds": 0.0}
+        self._question_number = 0
+        self._current = None
+        self._queue = asyncio.Queue()
+        self._task = None
+        self._closing = False
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def add_entry(self, role, text):
+        """Feed one committed transcript entry (same grouping as the backend)."""
+        if role == "interviewer":
+            self._submit_current()
+            self._question_number += 1
+            self._current = {
+                "questionNumber": self._question_number,
+                "questionText": text,
+                "candidateResponse": "",
+            }
+        elif role == "candidate" and self._current is not None:
+            if self._current["candidateResponse"]:
+                self._current["candidateResponse"] += " " + text
+            else:
+                self._current["candidateResponse"] = text
+
+    def _submit_current(self):
+        pair = self._current
+        self._current = None
+        if pair and len(pair["candidateResponse"].strip()) > MIN_RESPONSE_LENGTH:
+            self._queue.put_nowait(pair)
+
+    async def _run(self):
+        while True:
+            pair = await self._queue.get()
+            if pair is None:
+                return
+            batch = [pair]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = 0 if self._closing else deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    self._queue.put_nowait(None)
+                    break
+                batch.append(item)
+            await self._score_batch(batch)
+
+    async def _score_batch(self, batch):
+        messages = [
+            {"role": "system", "content": self.rubric},
+            {"role": "user", "content": build_batch_prompt(batch, self.analysis_type)},
+        ]
+        started = time.monotonic()
+        try:
+            content = await self.post_fn(messages, scoring_tier(self.analysis_type)["max_tokens"] * len(batch))
+            results = parse_batch_response(content)
+        except Exception as e:
+            print(f"Live scoring failed for {len(batch)} answer(s): {e}", flush=True)
+            self.stats["failures"] += 1
+            return
+        finally:
+            self.stats["llm_seconds"] += time.monotonic() - started
+            self.stats["batches"] += 1
+
+        for pair in batch:
+            evaluation = results.get(pair["questionNumber"])
+            if evaluation:
+                self.scores[pair["questionNumber"]] = evaluation
+                self.stats["pairs"] += 1
+
+    async def _post_cerebras(self, messages, max_tokens):
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        body = {
+            "model": SCORING_MODEL,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.3,
+        }
+        timeout = aiohttp.ClientTimeout(total=SCORING_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.post(CEREBRAS_API_URL, json=body, headers=headers) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"Cerebras API error {resp.status}: {await resp.text()}")
+                data = await resp.json()
+                usage = data.get("usage") or {}
+                if self.on_usage:
+                    self.on_usage(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+                return data["choices"][0]["message"]["content"]
+
+    async def finalize(self, timeout=SCORING_TIMEOUT):
+        """Score whatever is left and return the score sheet."""
+        self._submit_current()
+        self._closing = True
+        self._queue.put_nowait(None)
+        if self._task is None:
+            self.start()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            print("Live scoring did not finish in time, sending partial scores.", flush=True)
+            self._task.cancel()
+        return self.score_sheet()
+
+    def close(self):
+        """Stop scoring without finishing the queue (e.g. the session failed)."""
+        self._closing = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def score_sheet(self):
+        return {
+            "scores": [
+                {"questionNumber": number, **evaluation}
+                for number, evaluation in sorted(self.scores.items())
+            ],
+            "stats": {**self.stats, "analysisType": self.analysis_type},
+        }
@@ -0,0 +1,218 @@
+# IntervuAI speech analytics
+# Per-answer speaking rate, pause distribution and energy statistics computed
+# from the candidate's audio frames. The event loop only copies samples into
+# preallocated block buffers; full blocks are analysed with NumPy on a
+# dedicated thread, so nothing is allocated per frame and no maths runs on the
+# loop that carries audio.
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+SPEECH_ANALYTICS_ENABLED = os.environ.get("SPEECH_ANALYTICS", "true").lower() in ("1", "true", "yes")
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+BLOCK_MS = 500
+BLOCK_COUNT = 8
+
+# Voiced frames must be this far above the adaptive noise floor
+VOICE_MARGIN_DB = 12.0
+MIN_VOICE_DB = -50.0
+# Silences shorter than this are gaps between words, not pauses
+MIN_PAUSE_SECONDS = 0.25
+LONG_PAUSE_SECONDS = 2.0
+# Pause histogram upper bounds in seconds; the last count is pauses above 8s
+PAUSE_BUCKETS = (0.5, 1.0, 2.0, 4.0, 8.0)
+
+
+class SpeechAnalytics:
+    """Streaming per-answer audio statistics for one candidate."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS, block_ms=BLOCK_MS, block_count=BLOCK_COUNT):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_seconds = frame_ms / 1000
+        self.block_samples = sample_rate * block_ms // 1000 // self.frame_samples * self.frame_samples
+        frames_per_block = self.block_samples // self.frame_samples
+
+        # Loop side: preallocated sample blocks and a free list
+        self._blocks = np.zeros((block_count, self.block_samples), dtype=np.int16)
+        self._block_views = [memoryview(block).cast("B").cast("h") for block in self._blocks]
+        self._free = deque(range(block_count))
+        self._fill_block = self._free.popleft()
+        self._fill_pos = 0
+        self.dropped_frames = 0
+
+        # Analysis thread side: preallocated work buffers
+        self._work = np.zeros(self.block_samples, dtype=np.float32)
+        self._energy = np.zeros(frames_per_block, dtype=np.float32)
+        self._voiced = np.zeros(frames_per_block, dtype=bool)
+        self._pause_counts = np.zeros(len(PAUSE_BUCKETS) + 1, dtype=np.int64)
+        self._noise_db = None
+        self._reset_answer()
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech-analytics")
+
+    # -- event loop side ---------------------------------------------------
+
+    def push_frame(self, data):
+        """Copy one int16 mono frame (bytes-like) into the current block."""
+        samples = memoryview(data).cast("B").cast("h")
+        offset = 0
+        remaining = len(samples)
+        while remaining:
+            if self._fill_block is None:
+                if not self._free:
+                    self.dropped_frames += 1
+                    return
+                self._fill_block = self._free.popleft()
+                self._fill_pos = 0
+            count = min(remaining, self.block_samples - self._fill_pos)
+            self._block_views[self._fill_block][self._fill_pos:self._fill_pos + count] = samples[offset:offset + count]
+            self._fill_pos += count
+            offset += count
+            remaining -= count
+            if self._fill_pos == self.block_samples:
+                self._submit_block()
+
+    def _submit_block(self):
+        index, length = self._fill_block, self._fill_pos
+        self._fill_block = None
+        self._fill_pos = 0
+        self._executor.submit(self._process_block, index, length)
+
+    def start_answer(self):
+        """Discard audio so far (e.g. while the interviewer was speaking)."""
+        if self._fill_block is not None and self._fill_pos:
+            self._fill_pos = 0
+        return self._executor.submit(self._reset_answer)
+
+    def end_answer(self, word_count, word_timings=None):
+        """Flush buffered audio and return a Future with the answer's statistics.
+
+        `word_timings` is an optional sequence of (start, end) seconds per word,
+        as provided by Deepgram, used for inter-word gap statistics.
+        """
+        if self._fill_block is not None and self._fill_pos >= self.frame_samples:
+            self._submit_block()
+        return self._executor.submit(self._finish_answer, word_count, word_timings)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -- analysis thread side ------------------------------------------------
+
+    def _reset_answer(self):
+        self._frames = 0
+        self._voiced_frames = 0
+        self._first_voiced = None
+        self._last_voiced = None
+        self._energy_sum = 0.0
+        self._energy_sumsq = 0.0
+        self._silence_run = 0
+        self._pause_total = 0.0
+        self._pause_counts.fill(0)
+
+    def _process_block(self, index, length):
+        try:
+            frames = length // self.frame_samples
+            if frames:
+                self._analyse(self._blocks[index][:frames * self.frame_samples], frames)
+        finally:
+            self._free.append(index)
+
+    def _analyse(self, samples, frames):
+        work = self._work[:samples.size]
+        np.multiply(samples, 1.0 / 32768.0, out=work, casting="unsafe")
+        shaped = work.reshape(frames, self.frame_samples)
+        energy = self._energy[:frames]
+        np.einsum("ij,ij->i", shaped, shaped, out=energy)
+        energy *= 1.0 / self.frame_samples
+        energy += 1e-10
+        np.log10(energy, out=energy)
+        energy *= 10.0
+
+        # Adaptive noise floor from the quietest frames of each block
+        block_floor = float(energy.min())
+        if self._noise_db is None:
+            self._noise_db = block_floor
+        else:
+            self._noise_db = min(block_floor, 0.98 * self._noise_db + 0.02 * block_floor)
+        threshold = max(self._noise_db + VOICE_MARGIN_DB, MIN_VOICE_DB)
+        voiced = self._voiced[:frames]
+        np.greater(energy, threshold, out=voiced)
+
+        voiced_count = int(np.count_nonzero(voiced))
+        if voiced_count:
+            voiced_energy = energy[voiced]
+            self._energy_sum += float(voiced_energy.sum())
+            self._energy_sumsq += float(np.dot(voiced_energy, voiced_energy))
+
+            # Silence runs followed by speech are pauses; a trailing run carries over
+            seen_voice = self._first_voiced is not None
+            edges = np.flatnonzero(voiced[1:] != voiced[:-1]) + 1
+            run_start = 0
+            for edge in edges.tolist() + [frames]:
+                if not voiced[run_start]:
+                    self._silence_run += edge - run_start
+                    if edge < frames:
+                        self._close_pause(seen_voice)
+                elif self._silence_run:
+                    self._close_pause(seen_voice)
+                if voiced[run_start]:
+                    seen_voice = True
+                run_start = edge
+
+            if self._first_voiced is None:
+                self._first_voiced = self._frames + int(voiced.argmax())
+            self._last_voiced = self._frames + frames - 1 - int(voiced[::-1].argmax())
+        else:
+            self._silence_run += frames
+
+        self._frames += frames
+        self._voiced_frames += voiced_count
+
+    def _close_pause(self, after_speech):
+        seconds = self._silence_run * self.frame_seconds
+        self._silence_run = 0
+        # Silence before the first word is response latency, not a pause
+        if seconds < MIN_PAUSE_SECONDS or not after_speech:
+            return
+        self._pause_total += seconds
+        self._pause_counts[int(np.searchsorted(PAUSE_BUCKETS, seconds))] += 1
+
+    def _finish_answer(self, word_count, word_timings):
+        voiced_seconds = self._voiced_frames * self.frame_seconds
+        span_seconds = 0.0
+        if self._first_voiced is not None:
+            span_seconds = (self._last_voiced - self._first_voiced + 1) * self.frame_seconds
+        pauses = int(self._pause_counts.sum())
+        mean_db = self._energy_sum / self._voiced_frames if self._voiced_frames else None
+        std_db = None
+        if self._voiced_frames:
+            std_db = max(0.0, self._energy_sumsq / self._voiced_frames - mean_db ** 2) ** 0.5
+
+        stats = {
+            "audioSeconds": round(self._frames * self.frame_seconds, 2),
+            "voicedSeconds": round(voiced_seconds, 2),
+            "speakingSeconds": round(span_seconds, 2),
+            "wordsPerMinute": round(word_count / span_seconds * 60) if span_seconds >= 1 else None,
+            "articulationRate": round(word_count / voiced_seconds * 60) if voiced_seconds >= 1 else None,
+            "pauses": pauses,
+            "longPauses": int(self._pause_counts[np.searchsorted(PAUSE_BUCKETS, LONG_PAUSE_SECONDS) + 1:].sum()),
+            "pauseSeconds": round(self._pause_total, 2),
+            "meanPauseSeconds": round(self._pause_total / pauses, 2) if pauses else 0.0,
+            "pauseHistogram": self._pause_counts.tolist(),
+            "energyMeanDb": round(mean_db, 1) if mean_db is not None else None,
+            "energyStdDb": round(std_db, 1) if std_db is not None else None,
+        }
+
+        if word_timings is not None and len(word_timings) > 1:
+            timings = np.asarray(word_timings, dtype=np.float64)
+            gaps = timings[1:, 0] - timings[:-1, 1]
+            stats["wordGapMeanSeconds"] = round(float(gaps.mean()), 3)
+            stats["wordGapsOverHalfSecond"] = int(np.count_nonzero(gaps > 0.5))
+
+        self._reset_answer()
+        return stats
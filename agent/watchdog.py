@@ -0,0 +1,159 @@
+# IntervuAI event-loop watchdog
+# A heartbeat task samples event-loop lag; a monitor thread notices when the
+# heartbeat stops and captures the loop thread's stack while it is still
+# blocked, so we can see which callback stalled the audio path.
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+import weakref
+from observability import METRICS, LAG_BUCKETS
+
+LOOP_STALL_THRESHOLD = float(os.environ.get("LOOP_STALL_THRESHOLD", "0.1"))
+HEARTBEAT_INTERVAL = float(os.environ.get("LOOP_HEARTBEAT_INTERVAL", "0.05"))
+# Build heavy per-session objects (VAD model, provider clients) in a thread pool
+OFFLOAD_AGENT_SETUP = os.environ.get("OFFLOAD_AGENT_SETUP", "").lower() in ("1", "true", "yes")
+
+STACK_LIMIT = 12
+TOP_STACKS = 5
+# Distinct stacks counted per process; when full, the least-seen one is evicted
+MAX_TRACKED_STACKS = 50
+
+
+# Process-wide stall totals across every watched loop
+PROCESS_STALLS = {"stalls": 0, "blocked_seconds": 0.0, "stack_counts": {}}
+_process_lock = threading.Lock()
+
+
+class LoopWatchdog:
+    """Detects event-loop stalls longer than `threshold` and records their stacks.
+
+    One watchdog watches one loop; use get_watchdog() to get the running loop's.
+    """
+
+    def __init__(self, threshold=LOOP_STALL_THRESHOLD, interval=HEARTBEAT_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self._sessions = {}
+        self._last_beat = time.monotonic()
+        self._captured = None
+        self._loop = None
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start watching the running loop (idempotent per loop)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        with self._lock:
+            self._loop = loop
+            self._loop_thread_id = threading.get_ident()
+            self._last_beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+        self._task = self._loop = self._thread = None
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            METRICS.observe("loop_lag", lag, LAG_BUCKETS)
+            METRICS.loop_lag_max = max(METRICS.loop_lag_max, lag)
+            with self._lock:
+                self._last_beat = time.monotonic()
+                captured, self._captured = self._captured, None
+            if lag >= self.threshold:
+                self._record_stall(lag, captured)
+
+    def _monitor(self):
+        poll = max(self.threshold / 2, 0.005)
+        while not self._stop.wait(poll):
+            loop = self._loop
+            if loop is None or loop.is_closed():
+                return
+            with self._lock:
+                stalled_for = time.monotonic() - self._last_beat - self.interval
+                if stalled_for < self.threshold or self._captured is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._captured = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+
+    def _record_stall(self, duration, stack):
+        stack = stack or "<stack not captured: stall ended before the monitor sampled it>"
+        with _process_lock:
+            PROCESS_STALLS["stalls"] += 1
+            PROCESS_STALLS["blocked_seconds"] += duration
+            counts = PROCESS_STALLS["stack_counts"]
+            if stack not in counts and len(counts) >= MAX_TRACKED_STACKS:
+                del counts[min(counts, key=counts.get)]
+            counts[stack] = counts.get(stack, 0) + 1
+        METRICS.inc("loop_stalls")
+        METRICS.observe("loop_stall", duration, LAG_BUCKETS)
+        duration = round(duration, 4)
+        for report in self._sessions.values():
+            report["stalls"].append(duration)
+            if duration > report["longest"]["duration"]:
+                report["longest"] = {"duration": duration, "stack": stack}
+        print(f"Event loop blocked for {duration * 1000:.0f} ms:\n{stack}", file=sys.stderr, flush=True)
+
+    def begin_session(self, key):
+        self._sessions[key] = {"started": time.monotonic(), "stalls": [], "longest": {"duration": 0.0, "stack": None}}
+
+    def end_session(self, key):
+        """Stop tracking a session and return its stall summary."""
+        report = self._sessions.pop(key, None)
+        if report is None:
+            return None
+        durations = report["stalls"]
+        return {
+            "stalls": len(durations),
+            "blockedSeconds": round(sum(durations), 4),
+            "maxStallSeconds": max(durations, default=0.0),
+            "longestStallStack": report["longest"]["stack"],
+            "sessionSeconds": round(time.monotonic() - report["started"], 1),
+        }
+
+
+
+_watchdogs = weakref.WeakKeyDictionary()
+
+
+def get_watchdog():
+    """Return the running loop's watchdog, starting one if needed."""
+    loop = asyncio.get_running_loop()
+    watchdog = _watchdogs.get(loop)
+    if watchdog is None:
+        watchdog = _watchdogs[loop] = LoopWatchdog()
+        watchdog.start()
+    return watchdog
+
+
+def process_summary():
+    """Aggregate stall statistics for this process."""
+    with _process_lock:
+        counts = dict(PROCESS_STALLS["stack_counts"])
+        stalls, blocked = PROCESS_STALLS["stalls"], PROCESS_STALLS["blocked_seconds"]
+    top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:TOP_STACKS]
+    return {
+        "stalls": stalls,
+        "blockedSeconds": round(blocked, 4),
+        "topStacks": [{"count": count, "stack": stack} for stack, count in top],
+    }
@@ -3,6 +3,11 @@ import Interview from '../models/Interview.js';
 import User from '../models/User.js';
 import env from '../config/env.js';
 import { ApiResponse, ApiError, asyncHandler } from '../utils/apiResponse.js';
+import {
+  expandLiveResults,
+  LIVE_RESULTS_CLAIM_TTL_MS,
+  LIVE_RESULTS_RETRY_AFTER_SECONDS,
+} from '../utils/liveResults.js';
 import {
   generateInitialQuestion,
   evaluateResponse,
@@ -430,9 +435,11 @@ export const startLiveInterview = asyncHandler(async (req, res) => {
  * Save live interview results (called by the Python agent)
  * @route POST /api/interview/:id/save-live-results
  * @header x-agent-api-key
- * @body {transcript, interviewType, difficultyLevel}
+ * @header Idempotency-Key (optional; also carried in v2 envelopes)
+ * @body v2 result envelope (gzip allowed), or v1 {transcript, interviewType, difficultyLevel, scores?, scoring?, usage?}
  */
 export const saveLiveResults = asyncHandler(async (req, res) => {
+  const receivedAt = Date.now();
   const { id } = req.params;
   const agentKey = req.headers['x-agent-api-key'];
 
@@ -446,12 +453,65 @@ export const saveLiveResults = asyncHandler(async (req, res) => {
     throw new ApiError(404, 'Interview not found');
   }
 
-  const { transcript } = req.body;
-
-  if (!transcript || !Array.isArray(transcript)) {
+  const results = expandLiveResults(req.body);
+  if (!results.transcript || !Array.isArray(results.transcript)) {
     throw new ApiError(400, 'Invalid transcript data');
   }
 
+  // Claim the upload, so agent retries and concurrent uploads are not evaluated
+  // at the same time or twice. A claim is 'processing' until the results are
+  // saved, then 'done'; a failed attempt releases it. While any upload is
+  // processing, no other key may take over unless that claim has gone stale.
+  const idempotencyKey = results.idempotencyKey || req.headers['idempotency-key'] || null;
+  if (idempotencyKey) {
+    const claimed = await Interview.findOneAndUpdate(
+      {
+        _id: id,
+        $or: [
+          { liveResultsState: { $ne: 'processing' }, liveResultsKey: { $ne: idempotencyKey } },
+          { liveResultsState: 'processing', liveResultsClaimedAt: { $lt: new Date(receivedAt - LIVE_RESULTS_CLAIM_TTL_MS) } },
+        ],
+      },
+      { $set: { liveResultsKey: idempotencyKey, liveResultsState: 'processing', liveResultsClaimedAt: new Date(receivedAt) } }
+    );
+    if (!claimed) {
+      const current = await Interview.findById(id).select('liveResultsKey liveResultsState overallScore');
+      if (current?.liveResultsKey === idempotencyKey && current.liveResultsState !== 'processing') {
+        res.json(
+          new ApiResponse(200, { interviewId: id, overallScore: current.overallScore, duplicate: true }, 'Live interview results already received')
+        );
+        return;
+      }
+      // This or another upload is still being processed; the agent retries 5xx after Retry-After
+      res.set('Retry-After', String(LIVE_RESULTS_RETRY_AFTER_SECONDS));
+      throw new ApiError(503, 'Live interview results are still being processed');
+    }
+  }
+
+  try {
+    await applyLiveResults(interview, results, receivedAt);
+  } catch (error) {
+    if (idempotencyKey) {
+      await Interview.updateOne(
+        { _id: id, liveResultsKey: idempotencyKey },
+        { $unset: { liveResultsKey: 1, liveResultsState: 1, liveResultsClaimedAt: 1 } }
+      );
+    }
+    throw error;
+  }
+  if (idempotencyKey) {
+    await Interview.updateOne({ _id: id, liveResultsKey: idempotencyKey }, { $set: { liveResultsState: 'done' } });
+  }
+
+  res.json(
+    new ApiResponse(200, { interviewId: id, overallScore: interview.overallScore }, 'Live interview results saved')
+  );
+});
+
+/**
+ * Build questions, scores, summary and roadmap from a live transcript and save them
+ */
+const applyLiveResults = async (interview, { transcript, scores: agentScores, scoring, usage }, receivedAt) => {
   // Parse transcript into questions and responses
   const questions = [];
   let currentQuestion = null;
@@ -487,9 +547,35 @@ export const saveLiveResults = asyncHandler(async (req, res) => {
     questions.push(currentQuestion);
   }
 
-  // Evaluate each Q&A pair using AI
+  // Scores computed live by the agent, keyed by question number. They are only
+  // used when the agent scored at this interview's analysis tier.
+  const analysisType = interview.analysisType || 'basic';
+  const agentScoresMatchTier = (scoring?.analysisType || 'basic') === analysisType;
+  const agentScoreMap = new Map(
+    (agentScoresMatchTier && Array.isArray(agentScores) ? agentScores : [])
+      .filter(s => s && typeof s.score === 'number')
+      .map(s => [s.questionNumber, s])
+  );
+
+  // Evaluate each Q&A pair using AI (skipping pairs the agent already scored)
+  let agentScored = 0;
   for (const q of questions) {
-    if (q.candidateResponse && q.candidateResponse.trim().length > 10) {
+    const agentScore = agentScoreMap.get(q.questionNumber);
+    if (agentScore) {
+      q.aiEvaluation = {
+        score: agentScore.score,
+        technicalAccuracy: agentScore.technicalAccuracy,
+        communicationClarity: agentScore.communicationClarity,
+        problemSolving: agentScore.problemSolving,
+        depthOfKnowledge: agentScore.depthOfKnowledge,
+        practicalExperience: agentScore.practicalExperience,
+        feedback: agentScore.feedback || '',
+        improvementTip: agentScore.improvementTip || '',
+        estimatedLevel: agentScore.estimatedLevel || '',
+        followUpQuestion: agentScore.followUpQuestion || '',
+      };
+      agentScored++;
+    } else if (q.candidateResponse && q.candidateResponse.trim().length > 10) {
       try {
         const evaluation = await evaluateResponse(
           q.questionText,
@@ -587,13 +673,18 @@ export const saveLiveResults = asyncHandler(async (req, res) => {
 
   // Store raw transcript
   interview.liveTranscript = transcript;
+  if (usage && typeof usage === 'object') {
+    interview.agentUsage = usage;
+  }
 
   await interview.save();
 
-  res.json(
-    new ApiResponse(200, { interviewId: id, overallScore: interview.overallScore }, 'Live interview results saved')
+  const agentReadyMs = Math.round((scoring?.readyAfterSeconds || 0) * 1000);
+  console.log(
+    `Live results for ${interview._id}: ${agentScored}/${questions.length} scored by agent, ` +
+    `ready ${agentReadyMs + Date.now() - receivedAt}ms after session end`
   );
-});
+};
 
 /**
  * Complete a live interview (called by the frontend when user ends the session)
@@ -109,11 +109,37 @@ const interviewSchema = new mongoose.Schema(
       type: Boolean,
       default: false,
     },
+    // Idempotency key of the last claimed agent results upload, and whether
+    // that upload is still being processed or has been saved
+    liveResultsKey: String,
+    liveResultsState: {
+      type: String,
+      enum: ['processing', 'done'],
+    },
+    liveResultsClaimedAt: Date,
     liveTranscript: [
       {
         role: String,
         text: String,
+        // Epoch milliseconds (agent schema v2)
         timestamp: Number,
+        // Per-answer audio statistics computed by the agent
+        speechAnalytics: {
+          audioSeconds: Number,
+          voicedSeconds: Number,
+          speakingSeconds: Number,
+          wordsPerMinute: Number,
+          articulationRate: Number,
+          pauses: Number,
+          longPauses: Number,
+          pauseSeconds: Number,
+          meanPauseSeconds: Number,
+          pauseHistogram: [Number],
+          energyMeanDb: Number,
+          energyStdDb: Number,
+          wordGapMeanSeconds: Number,
+          wordGapsOverHalfSecond: Number,
+        },
       },
     ],
 
@@ -165,6 +191,18 @@ const interviewSchema = new mongoose.Schema(
       ],
     },
 
+    // Provider usage metered by the live agent
+    agentUsage: {
+      llmRequests: Number,
+      llmPromptTokens: Number,
+      llmCompletionTokens: Number,
+      sttAudioSeconds: Number,
+      ttsRequests: Number,
+      ttsCharacters: Number,
+      ttsAudioSeconds: Number,
+      estimatedCostUsd: Number,
+    },
+
     // Coach mode flag
     coachMode: {
       type: Boolean,
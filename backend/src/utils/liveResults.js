@@ -0,0 +1,65 @@
+// Live interview results posted by the Python agent.
+// Schema v2 is a compact envelope: columnar turns with millisecond offsets
+// from the session start (wall clock in session.startedAtMs), plus optional
+// scores, analytics and metrics sections. Bodies without a schemaVersion are
+// the original v1 payload and are passed through unchanged.
+import { ApiError } from './apiResponse.js';
+
+export const LIVE_RESULTS_SCHEMA_VERSION = 2;
+
+// Seconds an agent waits before retrying an upload that is still being processed
+export const LIVE_RESULTS_RETRY_AFTER_SECONDS = 15;
+// A processing claim older than this is assumed abandoned (e.g. a crashed
+// server) and can be taken over by a retry with the same key
+export const LIVE_RESULTS_CLAIM_TTL_MS = 10 * 60 * 1000;
+
+const isColumn = (value, length) => Array.isArray(value) && value.length === length;
+
+/**
+ * Expand a results body into {transcript, scores, scoring, usage, idempotencyKey}.
+ * Transcript timestamps are epoch milliseconds for v2 envelopes.
+ */
+export const expandLiveResults = (body) => {
+  if (!body || typeof body !== 'object') {
+    throw new ApiError(400, 'Invalid live results');
+  }
+  if (body.schemaVersion === undefined) {
+    const { transcript, scores, scoring, usage } = body;
+    return { transcript, scores, scoring, usage, idempotencyKey: null };
+  }
+  if (body.schemaVersion !== LIVE_RESULTS_SCHEMA_VERSION) {
+    throw new ApiError(400, `Unsupported live results schema v${body.schemaVersion}`);
+  }
+
+  const { turns = {}, session = {}, analytics, metrics = {} } = body;
+  const count = Array.isArray(turns.role) ? turns.role.length : -1;
+  if (!isColumn(turns.text, count) || !isColumn(turns.offsetMs, count)) {
+    throw new ApiError(400, 'Invalid turn columns');
+  }
+
+  const startedAtMs = Number(session.startedAtMs) || 0;
+  const transcript = turns.role.map((role, i) => ({
+    role,
+    text: turns.text[i],
+    timestamp: startedAtMs + turns.offsetMs[i],
+  }));
+
+  // Speech analytics rows point at candidate turns by index
+  if (analytics && Array.isArray(analytics.turn)) {
+    const fields = Object.keys(analytics).filter((field) => field !== 'turn');
+    analytics.turn.forEach((turnIndex, row) => {
+      const entry = transcript[turnIndex];
+      if (entry) {
+        entry.speechAnalytics = Object.fromEntries(fields.map((field) => [field, analytics[field]?.[row]]));
+      }
+    });
+  }
+
+  return {
+    transcript,
+    scores: body.scores,
+    scoring: metrics.scoring,
+    usage: metrics.usage,
+    idempotencyKey: body.idempotencyKey || null,
+  };
+};